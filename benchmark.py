@@ -0,0 +1,463 @@
+# Course: CS261 - Data Structures
+# Description: Timing comparisons for the DynamicArray and MinHeap implementations
+
+import argparse
+import functools
+import heapq
+import json
+import math
+import operator
+import os
+import platform
+import random
+import time
+import tracemalloc
+from collections import Counter
+
+from dynamic_array import DynamicArray, chunk, find_mode, natural_merge_sort
+from min_heap import MinHeap, heapsort
+
+# insert / remove benchmarks time this many operations on an array of the given size, not size operations
+EDIT_OPERATIONS = 1000
+
+# results more than this much slower than the ones in a --compare file are reported as regressions
+REGRESSION_RATIO = 1.25
+
+
+def best_time(func, repeat: int = 3) -> float:
+    """
+    Runs a function several times and returns the fastest run
+
+    :param func: a function with no arguments that performs the work being timed
+    :param repeat: the number of times the function is run
+
+    :return: a float representing the fastest run in seconds
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def report(name: str, size: int, old: float, new: float) -> None:
+    """
+    Prints one benchmark row comparing the old and new code paths
+    """
+    print(f"{name:<28}{size:>10}{old:>12.4f}{new:>12.4f}{old / new:>9.1f}x")
+
+
+def bench_bulk_construction(sizes) -> None:
+    """
+    Compares building arrays and heaps element by element against the bulk constructors
+    """
+
+    def append_each(values):
+        da = DynamicArray()
+        for value in values:
+            da.append(value)
+
+    def add_each(values):
+        h = MinHeap()
+        for value in values:
+            h.add(value)
+
+    for size in sizes:
+        values = [random.random() for _ in range(size)]
+        report("DynamicArray(start_array)", size,
+               best_time(lambda: append_each(values)), best_time(lambda: DynamicArray(values)))
+        report("MinHeap(start_heap)", size,
+               best_time(lambda: add_each(values)), best_time(lambda: MinHeap(values)))
+
+
+def bench_lazy_pipeline(sizes) -> None:
+    """
+    Compares eager map().filter().reduce() chains against the fused lazy pipeline
+    """
+    def triple(x):
+        return x * 3
+
+    def is_odd(x):
+        return x % 2
+
+    def add(x, y):
+        return x + y
+
+    for size in sizes:
+        da = DynamicArray(range(size))
+        report("map/filter/reduce", size,
+               best_time(lambda: da.map(triple).filter(is_odd).reduce(add)),
+               best_time(lambda: da.lazy().map(triple).filter(is_odd).reduce(add)))
+
+
+def bench_arity_matrix(size: int, arities=(2, 3, 4, 8)) -> None:
+    """
+    Times MinHeap with different arities on push-heavy, pop-heavy and mixed workloads, plus heapsort
+    """
+    values = [random.random() for _ in range(size)]
+
+    def push_heavy(arity):
+        # every value is pushed, only a tenth are popped
+        h = MinHeap(arity=arity)
+        for value in values:
+            h.add(value)
+        for _ in range(size // 10):
+            h.remove_min()
+
+    def pop_heavy(arity):
+        # the heap is built in one go and then fully drained
+        h = MinHeap(values, arity=arity)
+        while not h.is_empty():
+            h.remove_min()
+
+    def mixed(arity):
+        # a steady-state queue: half the values preload the heap, then every push is followed by a pop
+        h = MinHeap(values[:size // 2], arity=arity)
+        for value in values[size // 2:]:
+            h.add(value)
+            h.remove_min()
+
+    def sort(arity):
+        heapsort(DynamicArray(values), arity=arity)
+
+    workloads = [("push-heavy", push_heavy), ("pop-heavy", pop_heavy), ("mixed", mixed), ("heapsort", sort)]
+    print(f"{'workload':<14}" + "".join(f"{'arity ' + str(arity):>12}" for arity in arities))
+    for name, workload in workloads:
+        times = [best_time(lambda: workload(arity), repeat=1) for arity in arities]
+        print(f"{name:<14}" + "".join(f"{t:>11.3f}s" for t in times))
+
+
+def bench_adaptive_sort(size: int) -> None:
+    """
+    Compares heapsort with the run-aware natural merge sort on random, nearly sorted and sorted input
+    """
+    nearly_sorted = list(range(size))
+    for _ in range(size // 100):
+        i, j = random.randrange(size), random.randrange(size)
+        nearly_sorted[i], nearly_sorted[j] = nearly_sorted[j], nearly_sorted[i]
+    inputs = [("random", random.sample(range(size), size)), ("nearly sorted", nearly_sorted),
+              ("sorted", list(range(size)))]
+    for name, values in inputs:
+        report(f"sort ({name})", size,
+               best_time(lambda: heapsort(DynamicArray(values), reverse=True), repeat=1),
+               best_time(lambda: natural_merge_sort(DynamicArray(values)), repeat=1))
+
+
+def busy_square(value):
+    """
+    Deliberately CPU-heavy map function for the parallel benchmark (module level so it can be pickled)
+    """
+    result = value
+    for _ in range(200):
+        result = (result * result + value) % 1000003
+    return result
+
+
+def bench_parallel(size: int, max_workers: int = None) -> None:
+    """
+    Shows how parallel_map and parallel_reduce scale from 1 worker process up to max_workers
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    da = DynamicArray(range(size))
+    workers = 1
+    while workers <= max_workers:
+        map_time = best_time(lambda: da.parallel_map(busy_square, workers=workers), repeat=1)
+        reduce_time = best_time(lambda: da.parallel_reduce(operator.add, workers=workers), repeat=1)
+        print(f"parallel workers={workers:<3}{size:>10}   map {map_time:>8.3f}s   reduce {reduce_time:>8.3f}s")
+        workers *= 2
+
+
+def bench_typed_memory(size: int) -> None:
+    """
+    Compares the memory used by an object DynamicArray and a typed one holding the same floats
+    """
+    for typecode in (None, 'd'):
+        tracemalloc.start()
+        values = [random.random() for _ in range(size)]
+        da = DynamicArray(values, typecode=typecode)
+        del values
+        used = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        print(f"DynamicArray(typecode={typecode!r}) with {size} floats: {used / 2 ** 20:.1f} MiB")
+        del da
+
+
+def measure(setup, run, repeat: int = 3) -> float:
+    """
+    Like best_time(), but the state each run works on is rebuilt by setup() before every run, outside the timing
+
+    :param setup: a function with no arguments returning the state being worked on
+    :param run: a function taking that state and performing the work being timed
+
+    :return: a float representing the fastest run in seconds
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        state = setup()
+        start = time.perf_counter()
+        run(state)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _edits(size: int) -> int:
+    """
+    Return the number of insert / remove operations timed on an array of the given size
+    """
+    return min(size, EDIT_OPERATIONS)
+
+
+def _insert_each(da: DynamicArray, where) -> None:
+    for _ in range(_edits(da.length())):
+        da.insert_at_index(where(da.length()), 0)
+
+
+def _remove_each(da: DynamicArray, where) -> None:
+    for _ in range(_edits(da.length())):
+        da.remove_at_index(where(da.length()))
+
+
+def _list_insert_each(values: list, where) -> None:
+    for _ in range(_edits(len(values))):
+        values.insert(where(len(values)), 0)
+
+
+def _list_remove_each(values: list, where) -> None:
+    for _ in range(_edits(len(values))):
+        values.pop(where(len(values)))
+
+
+def _append_each(values) -> None:
+    da = DynamicArray()
+    for value in values:
+        da.append(value)
+
+
+def _list_append_each(values) -> None:
+    result = []
+    for value in values:
+        result.append(value)
+
+
+def _add_each(values) -> None:
+    h = MinHeap()
+    for value in values:
+        h.add(value)
+
+
+def _heappush_each(values) -> None:
+    h = []
+    for value in values:
+        heapq.heappush(h, value)
+
+
+def _remove_all(h: MinHeap) -> None:
+    while not h.is_empty():
+        h.remove_min()
+
+
+def _heappop_all(h: list) -> None:
+    while h:
+        heapq.heappop(h)
+
+
+def _heapified(values: list) -> list:
+    h = list(values)
+    heapq.heapify(h)
+    return h
+
+
+def _suite_cases() -> list:
+    """
+    Returns every case of the benchmark suite as a tuple of (name, number of operations for a size, setup, run,
+    baseline setup, baseline run). Setups take the size and the random input values, the baseline is the closest
+    stdlib list / heapq equivalent (None when there is none)
+    """
+    front, middle, end = (lambda n: 0), (lambda n: n // 2), (lambda n: n)
+    last = lambda n: n - 1
+    whole = lambda n: n
+
+    def array_of(size, values):
+        return DynamicArray(values)
+
+    def list_of(size, values):
+        return list(values)
+
+    def sorted_array(size, values):
+        return DynamicArray(sorted(values))
+
+    def inputs(size, values):
+        return values
+
+    cases = [("append", whole, inputs, _append_each, inputs, _list_append_each)]
+    for name, where in (("front", front), ("middle", middle), ("end", end)):
+        cases.append((f"insert_at_index {name}", _edits, array_of, functools.partial(_insert_each, where=where),
+                      list_of, functools.partial(_list_insert_each, where=where)))
+    for name, where in (("front", front), ("middle", middle), ("end", last)):
+        cases.append((f"remove_at_index {name}", _edits, array_of, functools.partial(_remove_each, where=where),
+                      list_of, functools.partial(_list_remove_each, where=where)))
+    cases += [
+        ("resize", lambda n: 1, array_of, lambda da: da.resize(da.length() * 2),
+         list_of, lambda values: values.extend([None] * len(values))),
+        ("slice", whole, array_of, lambda da: da.slice(0, da.length() // 2),
+         list_of, lambda values: values[:len(values) // 2]),
+        ("map", whole, array_of, lambda da: da.map(abs), list_of, lambda values: list(map(abs, values))),
+        ("filter", whole, array_of, lambda da: da.filter(bool), list_of, lambda values: list(filter(bool, values))),
+        ("reduce", whole, array_of, lambda da: da.reduce(max),
+         list_of, lambda values: functools.reduce(max, values)),
+        ("chunk", whole, array_of, chunk, None, None),
+        ("find_mode", whole, sorted_array, find_mode, list_of, lambda values: Counter(values).most_common(1)),
+        ("MinHeap.add", whole, inputs, _add_each, inputs, _heappush_each),
+        ("MinHeap.remove_min", whole, lambda size, values: MinHeap(values), _remove_all,
+         lambda size, values: _heapified(values), _heappop_all),
+        ("MinHeap.build_heap", whole, array_of, lambda da: MinHeap().build_heap(da), list_of, heapq.heapify),
+        ("heapsort", whole, array_of, heapsort, list_of, lambda values: values.sort(reverse=True)),
+    ]
+    return cases
+
+
+def _exponent(previous: dict, current: dict) -> str:
+    """
+    Return the empirical growth exponent between two results of a case: 1 means the time grows linearly with the
+    size, 2 quadratically and so on
+    """
+    if previous is None or previous["seconds"] <= 0 or current["seconds"] <= 0:
+        return ""
+    return f"{math.log(current['seconds'] / previous['seconds']) / math.log(current['size'] / previous['size']):.2f}"
+
+
+def run_suite(sizes, repeat: int = 3, budget: float = 10.0) -> list:
+    """
+    Times every suite case at every size against its stdlib baseline and prints one table per case. The last
+    column is the growth exponent since the previous size, which gives the scaling curve of the operation. Larger
+    sizes of a case are skipped once a run of the next size is expected to take longer than budget seconds, even
+    if the operation only grows linearly
+
+    :return: a list of result dictionaries, one per case and size (see save_results())
+    """
+    results = []
+    for name, operations, setup, run, base_setup, base_run in _suite_cases():
+        print(f"\n{name}")
+        print(f"{'size':>10}{'total (s)':>12}{'per op (us)':>13}{'baseline (s)':>14}{'ratio':>9}{'growth':>8}")
+        previous = None
+        for position, size in enumerate(sizes):
+            values = [random.random() for _ in range(size)]
+            seconds = measure(lambda: setup(size, values), run, repeat)
+            baseline = None
+            if base_run is not None:
+                baseline = measure(lambda: base_setup(size, values), base_run, repeat)
+            result = {"case": name, "size": size, "operations": operations(size), "seconds": seconds,
+                      "baseline_seconds": baseline}
+            ratio = f"{seconds / baseline:>8.1f}x" if baseline else f"{'-':>9}"
+            baseline_text = f"{baseline:>14.5f}" if baseline is not None else f"{'-':>14}"
+            print(f"{size:>10}{seconds:>12.5f}{seconds / result['operations'] * 1e6:>13.3f}{baseline_text}"
+                  f"{ratio}{_exponent(previous, result):>8}")
+            results.append(result)
+            previous = result
+            if position + 1 < len(sizes) and seconds * sizes[position + 1] / size > budget:
+                print(f"{'':>10}larger sizes skipped, the next run would take longer than {budget}s")
+                break
+    return results
+
+
+def save_results(results: list, path: str) -> None:
+    """
+    Saves suite results as JSON, together with the Python version and platform they were measured on
+    """
+    document = {"python": platform.python_version(), "platform": platform.platform(),
+                "created": time.strftime("%Y-%m-%dT%H:%M:%S"), "results": results}
+    with open(path, "w") as fp:
+        json.dump(document, fp, indent=2)
+
+
+def compare_results(results: list, path: str) -> list:
+    """
+    Compares suite results with the ones saved in an earlier JSON file and prints every case and size that got
+    more than REGRESSION_RATIO times slower
+
+    :return: a list of (case, size, old seconds, new seconds) tuples, one per regression
+    """
+    with open(path) as fp:
+        old = {(result["case"], result["size"]): result["seconds"] for result in json.load(fp)["results"]}
+    regressions = []
+    for result in results:
+        before = old.get((result["case"], result["size"]))
+        if before and result["seconds"] > before * REGRESSION_RATIO:
+            regressions.append((result["case"], result["size"], before, result["seconds"]))
+    print(f"\n{len(regressions)} regression(s) compared with {path}")
+    for case, size, before, after in regressions:
+        print(f"{case:<28}{size:>10}{before:>12.5f}{after:>12.5f}{after / before:>9.2f}x")
+    return regressions
+
+
+def _chunk_by_append(arr: DynamicArray) -> DynamicArray:
+    """
+    The element-by-element chunk() the exact sizing replaced, kept as the baseline of bench_chunk_memory()
+    """
+    chunk_arr = DynamicArray()
+    current_chunk = DynamicArray()
+    current_chunk.append(arr[0])
+    for i in range(1, arr.length()):
+        if arr[i] >= arr[i - 1]:
+            current_chunk.append(arr[i])
+        else:
+            chunk_arr.append(current_chunk)
+            current_chunk = DynamicArray()
+            current_chunk.append(arr[i])
+    chunk_arr.append(current_chunk)
+    return chunk_arr
+
+
+def bench_chunk_memory(size: int) -> None:
+    """
+    Compares the memory held by the result of chunk() on its worst case, an alternating input that splits into a
+    run every one or two values, with the memory held by the same runs built by appending value by value
+    """
+    da = DynamicArray([1, 0] * (size // 2))
+    for name, func in (("append per value", _chunk_by_append), ("exact runs", chunk)):
+        tracemalloc.start()
+        runs = func(da)
+        used = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        print(f"chunk ({name}) of {size} alternating values: {runs.length()} runs, {used / 2 ** 20:.1f} MiB, "
+              f"{used / runs.length():.0f} bytes per run")
+        del runs
+
+
+def run_comparisons() -> None:
+    """
+    Runs the before / after comparisons of individual optimizations
+    """
+    print(f"{'benchmark':<28}{'size':>10}{'old (s)':>12}{'new (s)':>12}{'speedup':>10}")
+    bench_bulk_construction([10 ** 3, 10 ** 4, 10 ** 5])
+    bench_lazy_pipeline([10 ** 3, 10 ** 4, 10 ** 5])
+    bench_typed_memory(10 ** 6)
+    bench_chunk_memory(10 ** 6)
+    bench_arity_matrix(10 ** 5)
+    bench_adaptive_sort(10 ** 5)
+    bench_parallel(2 * 10 ** 5)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="DynamicArray and MinHeap benchmarks")
+    parser.add_argument("what", nargs="?", choices=("suite", "comparisons"), default="suite",
+                        help="the operation suite with stdlib baselines, or the before / after comparisons")
+    parser.add_argument("--min-exponent", type=int, default=2, help="smallest size is 10 ** this")
+    parser.add_argument("--max-exponent", type=int, default=7, help="largest size is 10 ** this")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per measurement, the fastest is kept")
+    parser.add_argument("--budget", type=float, default=10.0, help="seconds per run before larger sizes are skipped")
+    parser.add_argument("--json", help="file the suite results are saved to")
+    parser.add_argument("--compare", help="earlier JSON results to check for regressions")
+    args = parser.parse_args()
+
+    random.seed(261)
+    if args.what == "comparisons":
+        run_comparisons()
+    else:
+        suite_results = run_suite([10 ** e for e in range(args.min_exponent, args.max_exponent + 1)],
+                                  args.repeat, args.budget)
+        if args.json:
+            save_results(suite_results, args.json)
+        if args.compare:
+            compare_results(suite_results, args.compare)
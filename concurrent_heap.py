@@ -0,0 +1,361 @@
+# Course: CS261 - Data Structures
+# Description: Thread-safe and asyncio priority queues built on MinHeap
+
+import asyncio
+import threading
+import time
+
+from min_heap import DynamicArray, MinHeap, MinHeapException
+
+
+class ConcurrentMinHeap:
+    """
+    Thread-safe priority queue wrapping a MinHeap. Every operation holds one internal lock, pop() can block until a
+    node is available and, when maxsize is set, put() blocks while the heap is full so fast producers are slowed
+    down to the speed of the consumers (backpressure)
+    """
+
+    def __init__(self, start_heap=None, maxsize: int = 0, **heap_options) -> None:
+        """
+        Initialize a new ConcurrentMinHeap
+
+        :param start_heap: optional initial nodes
+        :param maxsize: the largest number of nodes the heap may hold, 0 for no limit
+        :param heap_options: passed on to MinHeap (typecode, arity, key, reverse)
+        """
+        self._heap = MinHeap(start_heap, **heap_options)
+        self._maxsize = maxsize
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
+
+    def __str__(self) -> str:
+        """
+        Return ConcurrentMinHeap content in human-readable form
+        """
+        with self._lock:
+            return "CONCURRENT_" + str(self._heap)
+
+    def size(self) -> int:
+        """
+        Return the number of nodes in the heap
+        """
+        with self._lock:
+            return self._heap.size()
+
+    def is_empty(self) -> bool:
+        """
+        Return True if the heap is empty / False otherwise
+        """
+        with self._lock:
+            return self._heap.is_empty()
+
+    def _room(self) -> int:
+        """
+        Return how many nodes can be added before the heap is full, or None when there is no limit (the lock must
+        be held). A heap started with more than maxsize nodes has no room until it falls below maxsize
+        """
+        if self._maxsize <= 0:
+            return None
+        return max(self._maxsize - self._heap.size(), 0)
+
+    def _is_full(self) -> bool:
+        """
+        Return True if the heap holds maxsize nodes or more (the lock must be held)
+        """
+        return self._room() == 0
+
+    @staticmethod
+    def _wait(condition: threading.Condition, ready, timeout: float) -> None:
+        """
+        Waits on condition until ready() is true, raising MinHeapException if the timeout runs out first
+        """
+        if not condition.wait_for(ready, timeout):
+            raise MinHeapException("Timed Out Waiting For The Heap")
+
+    def put(self, node: object, block: bool = True, timeout: float = None) -> None:
+        """
+        Adds a node, waiting for room if the heap is full
+
+        :param node: an object that is being added to the heap
+        :param block: when False a full heap raises MinHeapException straight away
+        :param timeout: the longest time to wait, in seconds (None waits forever)
+        """
+        with self._not_full:
+            if block:
+                self._wait(self._not_full, lambda: not self._is_full(), timeout)
+            elif self._is_full():
+                raise MinHeapException("This Heap Is Full")
+            self._heap.add(node)
+            self._not_empty.notify()
+
+    def put_many(self, nodes, timeout: float = None) -> int:
+        """
+        Adds every node of an iterable, taking the lock once per batch that fits instead of once per node. With a
+        size limit the nodes are added in as many batches as there is room for. If the timeout runs out part way,
+        the nodes added so far stay in the heap and the MinHeapException raised has their number in its added
+        attribute
+
+        :param nodes: an iterable of the objects being added
+        :param timeout: the longest time to wait for room for each batch, in seconds (None waits forever)
+
+        :return: the number of nodes added
+        """
+        batch = list(nodes)
+        start = 0
+        with self._not_full:
+            while start < len(batch):
+                try:
+                    self._wait(self._not_full, lambda: not self._is_full(), timeout)
+                except MinHeapException as error:
+                    error.added = start
+                    raise
+                room = self._room()
+                end = len(batch) if room is None else min(len(batch), start + room)
+                self._heap.push_many(batch[start:end])
+                self._not_empty.notify(end - start)
+                start = end
+        return start
+
+    def pop(self, block: bool = True, timeout: float = None) -> object:
+        """
+        Removes and returns the smallest node, waiting for one if the heap is empty
+
+        :param block: when False an empty heap raises MinHeapException straight away
+        :param timeout: the longest time to wait, in seconds (None waits forever)
+
+        :return: the smallest node
+        """
+        with self._not_empty:
+            if block:
+                self._wait(self._not_empty, lambda: not self._heap.is_empty(), timeout)
+            elif self._heap.is_empty():
+                raise MinHeapException("This Heap Is Empty")
+            node = self._heap.remove_min()
+            self._not_full.notify()
+            return node
+
+    def drain(self, max_items: int = None) -> DynamicArray:
+        """
+        Removes up to max_items of the smallest nodes (all of them by default) under a single lock, without waiting
+
+        :return: a DynamicArray with the removed nodes, smallest first
+        """
+        with self._lock:
+            count = self._heap.size() if max_items is None else max_items
+            result = self._heap.pop_many(count)
+            self._not_full.notify(result.length())
+            return result
+
+    def get_min(self) -> object:
+        """
+        Return the smallest node without removing it
+        """
+        with self._lock:
+            return self._heap.get_min()
+
+
+class AsyncMinHeap:
+    """
+    Priority queue wrapping a MinHeap for asyncio tasks: get() and put() are awaitable and suspend the task while
+    the heap is empty or (with maxsize set) full. It must only be used from one event loop
+    """
+
+    def __init__(self, start_heap=None, maxsize: int = 0, **heap_options) -> None:
+        """
+        Initialize a new AsyncMinHeap
+
+        :param start_heap: optional initial nodes
+        :param maxsize: the largest number of nodes the heap may hold, 0 for no limit
+        :param heap_options: passed on to MinHeap (typecode, arity, key, reverse)
+        """
+        self._heap = MinHeap(start_heap, **heap_options)
+        self._maxsize = maxsize
+        self._changed = asyncio.Condition()
+        # the pending task started by _wake_waiters(), kept so the event loop cannot garbage-collect it
+        self._notify_task = None
+
+    def size(self) -> int:
+        """
+        Return the number of nodes in the heap
+        """
+        return self._heap.size()
+
+    def is_empty(self) -> bool:
+        """
+        Return True if the heap is empty / False otherwise
+        """
+        return self._heap.is_empty()
+
+    def is_full(self) -> bool:
+        """
+        Return True if the heap has reached maxsize / False otherwise
+        """
+        return 0 < self._maxsize <= self._heap.size()
+
+    async def put(self, node: object) -> None:
+        """
+        Adds a node, waiting for room if the heap is full
+        """
+        async with self._changed:
+            await self._changed.wait_for(lambda: not self.is_full())
+            self._heap.add(node)
+            self._changed.notify_all()
+
+    async def get(self) -> object:
+        """
+        Removes and returns the smallest node, waiting for one if the heap is empty
+        """
+        async with self._changed:
+            await self._changed.wait_for(lambda: not self._heap.is_empty())
+            node = self._heap.remove_min()
+            self._changed.notify_all()
+            return node
+
+    def put_nowait(self, node: object) -> None:
+        """
+        Adds a node without waiting, a full heap raises MinHeapException
+        """
+        if self.is_full():
+            raise MinHeapException("This Heap Is Full")
+        self._heap.add(node)
+        self._wake_waiters()
+
+    def get_nowait(self) -> object:
+        """
+        Removes and returns the smallest node without waiting, an empty heap raises MinHeapException
+        """
+        node = self._heap.remove_min()
+        self._wake_waiters()
+        return node
+
+    def drain(self, max_items: int = None) -> DynamicArray:
+        """
+        Removes up to max_items of the smallest nodes (all of them by default) without waiting
+
+        :return: a DynamicArray with the removed nodes, smallest first
+        """
+        result = self._heap.pop_many(self._heap.size() if max_items is None else max_items)
+        self._wake_waiters()
+        return result
+
+    def _wake_waiters(self) -> None:
+        """
+        Lets tasks waiting in get() / put() re-check the heap after a non-waiting call changed it. Notifying needs
+        the condition's lock, so it happens in a task; while one is still pending it covers later changes as well
+        """
+        async def notify():
+            async with self._changed:
+                self._changed.notify_all()
+
+        if self._notify_task is not None and not self._notify_task.done():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # outside an event loop no task can be waiting
+            return
+        self._notify_task = loop.create_task(notify())
+
+
+# ------------------- BASIC TESTING -----------------------------------------
+
+
+if __name__ == "__main__":
+    import random
+
+    print("\n# ConcurrentMinHeap stress test")
+    producers, consumers, per_producer = 8, 4, 5000
+    heap = ConcurrentMinHeap(maxsize=1000)
+    received = [[] for _ in range(consumers)]
+    # when each consumer popped its last node, so the time the consumers spend timing out is not counted
+    finished = [0.0] * consumers
+
+    def produce(seed):
+        rng = random.Random(seed)
+        for _ in range(per_producer // 100):
+            heap.put_many(rng.random() for _ in range(100))
+
+    def consume(index):
+        out = received[index]
+        while True:
+            try:
+                out.append(heap.pop(timeout=0.5))
+            except MinHeapException:
+                return
+            finished[index] = time.perf_counter()
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=produce, args=(seed,)) for seed in range(producers)]
+    threads += [threading.Thread(target=consume, args=(i,)) for i in range(consumers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = max(finished) - start
+    total = sum(len(out) for out in received)
+    assert total == producers * per_producer
+    print(f"{total} nodes through {producers} producers / {consumers} consumers, "
+          f"about {total / elapsed:,.0f} nodes per second")
+
+    print("\n# ConcurrentMinHeap ordering once every producer has finished")
+    heap = ConcurrentMinHeap()
+    threads = [threading.Thread(target=produce, args=(seed,)) for seed in range(producers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    received = [[] for _ in range(consumers)]
+    threads = [threading.Thread(target=consume, args=(i,)) for i in range(consumers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    # every consumer pops a non-decreasing sequence, since pops happen one at a time under the lock
+    assert all(out == sorted(out) for out in received)
+    print("every consumer received its nodes in non-decreasing order")
+
+    print("\n# ConcurrentMinHeap started with more than maxsize nodes")
+    heap = ConcurrentMinHeap([5, 4, 3], maxsize=2)
+    try:
+        heap.put(1, block=False)
+    except MinHeapException as error:
+        print(error)
+    heap.pop()
+    heap.pop()
+    try:
+        heap.put_many([2, 1, 0], timeout=0.1)
+    except MinHeapException as error:
+        print(f"{error} after adding {error.added} node(s):", heap)
+
+    print("\n# AsyncMinHeap example 1")
+
+    async def main():
+        queue = AsyncMinHeap(maxsize=10)
+
+        async def producer(seed):
+            rng = random.Random(seed)
+            for _ in range(1000):
+                await queue.put(rng.randint(0, 10 ** 6))
+
+        async def consumer(out):
+            for _ in range(2000):
+                out.append(await queue.get())
+
+        outputs = [[], []]
+        await asyncio.gather(*(producer(seed) for seed in range(4)), *(consumer(out) for out in outputs))
+        print(f"{sum(map(len, outputs))} nodes passed through, heap size now {queue.size()}")
+
+    asyncio.run(main())
+
+    print("\n# AsyncMinHeap waking a waiting get() from put_nowait()")
+
+    async def wake():
+        queue = AsyncMinHeap()
+        waiter = asyncio.ensure_future(queue.get())
+        await asyncio.sleep(0)
+        for value in [3, 1, 2]:
+            queue.put_nowait(value)
+        print(await asyncio.wait_for(waiter, 1), queue.drain())
+
+    asyncio.run(wake())
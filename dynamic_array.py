@@ -5,7 +5,18 @@
 # Due Date: 4/26/2025
 # Description: Creating DynamicArray functionality
 
-from static_array import StaticArray
+import os
+import pickle
+import struct
+import sys
+from array import array
+from itertools import islice
+
+from growth import DEFAULT_POLICY, GrowthPolicy
+from mapped_array import MappedArray
+from storage import EmptyStorage, ListArray, SmallArray, default_backend, empty_storage, make_storage
+from typed_array import TypedArray
+from vectorized import NOT_VECTORIZED, vector_filter, vector_map, vector_reduce
 
 
 class DynamicArrayException(Exception):
@@ -16,21 +27,231 @@ class DynamicArrayException(Exception):
     pass
 
 
+# dump() header: magic, format version, typecode (NUL for objects), item size, big-endian flag, size, capacity,
+# followed (from version 2) by the length and name of the storage backend
+_DUMP_MAGIC = b"DYNA"
+_DUMP_HEADER = struct.Struct("<4sBcBBQQ")
+_DUMP_VERSION = 2
+# objects are pickled this many at a time, which is much faster than pickling the storage value by value
+DUMP_BATCH = 4096
+
+# arrays smaller than this are mapped / reduced serially, since starting worker processes costs more than it saves
+PARALLEL_THRESHOLD = 50_000
+
+
+def _map_chunk(map_func, values) -> list:
+    """
+    Worker side of DynamicArray.parallel_map(): maps one chunk of values
+    """
+    return [map_func(value) for value in values]
+
+
+def _reduce_chunk(reduce_func, values) -> object:
+    """
+    Worker side of DynamicArray.parallel_reduce(): reduces one (non-empty) chunk of values
+    """
+    result = values[0]
+    for i in range(1, len(values)):
+        result = reduce_func(result, values[i])
+    return result
+
+
+def _move_block(source, source_start: int, dest, dest_start: int, count: int) -> None:
+    """
+    Copies a block of values from one underlying storage array into another (or the same) one
+
+    Overlapping blocks in the same storage are copied in the safe direction, so the helper can be used to
+    shift values left or right in place. Bounds are the caller's responsibility.
+
+    :param source: the storage array being copied from
+    :param source_start: the index of the first value being copied
+    :param dest: the storage array being copied into
+    :param dest_start: the index the first value is copied to
+    :param count: the number of values being copied
+    """
+    if count <= 0 or (source is dest and source_start == dest_start):
+        return
+    if isinstance(dest, TypedArray) and isinstance(source, TypedArray) and dest.typecode == source.typecode:
+        # typed buffers of the same kind are moved with a single slice assignment
+        dest.copy_from(dest_start, source, source_start, count)
+        return
+    if isinstance(dest, ListArray) and isinstance(source, (ListArray, list, tuple)):
+        dest.copy_from(dest_start, source, source_start, count)
+        return
+    if isinstance(dest, SmallArray) and isinstance(source, (SmallArray, ListArray, list, tuple)):
+        dest.copy_from(dest_start, source, source_start, count)
+        return
+    if source is dest and source_start < dest_start:
+        # shifting right, so copy from the end to avoid overwriting values that have not been moved yet
+        for i in range(count - 1, -1, -1):
+            dest[dest_start + i] = source[source_start + i]
+    else:
+        for i in range(count):
+            dest[dest_start + i] = source[source_start + i]
+
+
+def _iterate(arr: "DynamicArray", start: int, stop: int, step: int):
+    """
+    Iterator shared by DynamicArray and DynamicArrayView. It walks over a snapshot of the index range taken when
+    the loop starts and reads the list / array.array inside the storage directly, without a bounds-checked get()
+    per value. Values written during the loop are seen but values appended during the loop are not. It stops early
+    if the array shrinks below the current index, and switches to the new storage when a resize replaces it
+
+    :param arr: the DynamicArray being iterated over
+    :param start: the first index visited
+    :param stop: the index the loop stops at (not visited)
+    :param step: 1 to go forwards, -1 to go backwards
+    """
+    storage = arr._data
+    data = _readable(storage)
+    for index in range(start, stop, step):
+        if index >= arr._size:
+            return
+        if arr._data is not storage:
+            storage = arr._data
+            data = _readable(storage)
+        yield data[index]
+
+
+def _readable(storage):
+    """
+    Return the list inside a ListArray or the array.array inside a TypedArray, any other storage as it is. A
+    MappedArray is read through itself, since resizing it remaps the file without replacing the storage object
+    """
+    if type(storage) is ListArray or type(storage) is TypedArray:
+        return storage.raw()
+    return storage
+
+
 class DynamicArray:
-    def __init__(self, start_array=None):
+    __slots__ = ("_size", "_capacity", "_typecode", "_backend", "_policy", "_data")
+
+    def __init__(self, start_array=None, typecode: str = None, backend: str = None, policy: GrowthPolicy = None):
         """
         Initialize new dynamic array
-        DO NOT CHANGE THIS METHOD IN ANY WAY
+
+        When a typecode ('i', 'q', 'd', ... as used by the array module) is given the values are stored unboxed
+        in a compact TypedArray, and writing a value that does not fit raises TypedArrayException.
+        backend chooses the storage array by name (see storage.BACKENDS): "list" (the default for objects, which
+        keeps arrays of up to storage.SMALL_CAPACITY values in the slots of a SmallArray),
+        "typed" (the default with a typecode), "static" when the static_array module is installed, or one added
+        with storage.register_backend().
+        policy decides how the capacity grows and shrinks (see growth.GrowthPolicy), by default it doubles when
+        full and shrinks once less than a quarter full
         """
         self._size = 0
         self._capacity = 4
-        self._data = StaticArray(self._capacity)
+        self._typecode = typecode
+        self._backend = backend or default_backend(typecode)
+        self._policy = policy or DEFAULT_POLICY
+        # the storage is only allocated on the first write, until then the array shares an empty one
+        self._data = empty_storage(self._backend, self._capacity, typecode)
 
         # populate dynamic array with initial values (if provided)
-        # before using this feature, implement append() method
+        # extend() sizes the underlying storage once instead of resizing per append
         if start_array is not None:
-            for value in start_array:
-                self.append(value)
+            self.extend(start_array)
+
+    @classmethod
+    def from_iterable(cls, values, typecode: str = None) -> "DynamicArray":
+        """
+        Creates a new Dynamic array holding every value from an iterable
+
+        :param values: an iterable (list, DynamicArray, generator...) of the values to store
+        :param typecode: optional typecode for compact numeric storage
+
+        :return: a new dynamic array containing the values in iteration order
+        """
+        arr = cls(typecode=typecode)
+        arr.extend(values)
+        return arr
+
+    @classmethod
+    def _from_storage(cls, storage, size: int) -> "DynamicArray":
+        """
+        Creates a Dynamic array that takes over an already filled storage array (a TypedArray) or list of values
+        """
+        if not isinstance(storage, TypedArray):
+            return cls(storage)
+        arr = cls(typecode=storage.typecode)
+        arr._data = storage
+        arr._capacity = storage.length()
+        arr._size = size
+        return arr
+
+    @classmethod
+    def mapped(cls, path: str, typecode: str = None, readonly: bool = False) -> "DynamicArray":
+        """
+        Creates a Dynamic array stored in a memory-mapped file (see MappedArray). An existing file is opened with
+        the length and typecode saved by the last flush() / close() without reading any values, otherwise a new
+        file is created, which needs a fixed-width numeric typecode
+
+        :param path: the file storing the values
+        :param typecode: the typecode of the values, required when the file does not exist yet
+        :param readonly: maps the file read-only, so it can be shared by several processes
+
+        :return: a dynamic array backed by the file
+        """
+        storage = MappedArray(path, capacity=4, typecode=typecode, readonly=readonly)
+        arr = cls(typecode=storage.typecode)
+        arr._data = storage
+        arr._capacity = storage.length()
+        arr._size = storage.size
+        arr._backend = "mapped"
+        return arr
+
+    def _derived(self, typecode: str = None) -> "DynamicArray":
+        """
+        Creates a new empty array for values taken from this one (slices, map() / filter() results ...) on the same
+        storage backend. Copies of a file backed array stay in memory, and values that lose this array's typecode
+        (map() results) go to the default backend for their own typecode
+        """
+        backend = self._backend
+        if backend == "mapped" or typecode != self._typecode:
+            backend = None
+        return DynamicArray(typecode=typecode, backend=backend)
+
+    def _new_storage(self, capacity: int):
+        """
+        Creates the underlying fixed size storage array of the array's backend
+        """
+        return make_storage(self._backend, capacity, self._typecode)
+
+    def _allocate(self) -> None:
+        """
+        Replaces the shared empty storage of a new array with its own, before the first value is written
+        """
+        if isinstance(self._data, EmptyStorage):
+            self._data = self._new_storage(self._capacity)
+
+    def _raw(self):
+        """
+        Return the fastest indexable form of the storage for internal kernels that do their own bounds checking:
+        the array.array inside a TypedArray or the list inside a ListArray, otherwise the storage array itself
+        """
+        if isinstance(self._data, (TypedArray, ListArray)):
+            return self._data.raw()
+        return self._data
+
+    def _as_block(self, values) -> tuple:
+        """
+        Turns a sized collection of values into an indexable block that _move_block() can copy from. Values for a
+        typed array are validated (and packed) all at once, before the array is modified
+
+        :param values: a sized collection of the values being added
+
+        :return: a tuple with the block and the number of values in it
+        """
+        if isinstance(values, DynamicArray) and values._typecode == self._typecode:
+            return values._data, values.length()
+        if self._typecode is not None:
+            block = self._data.pack(values)
+            return block, block.length()
+        if isinstance(values, DynamicArray):
+            return values._data, values.length()
+        if not isinstance(values, (list, tuple)):
+            values = list(values)
+        return values, len(values)
 
     def __str__(self) -> str:
         """
@@ -44,24 +265,16 @@ class DynamicArray:
 
     def __iter__(self):
         """
-        Create iterator for loop
-        DO NOT CHANGE THIS METHOD IN ANY WAY
+        Create iterator for loop. Every call returns a new, independent iterator so loops over the same array
+        can be nested
         """
-        self._index = 0
-        return self
+        return _iterate(self, 0, self._size, 1)
 
-    def __next__(self):
+    def __reversed__(self):
         """
-        Obtain next value and advance iterator
-        DO NOT CHANGE THIS METHOD IN ANY WAY
+        Create iterator that goes over the array from the last element to the first
         """
-        try:
-            value = self[self._index]
-        except DynamicArrayException:
-            raise StopIteration
-
-        self._index += 1
-        return value
+        return _iterate(self, self._size - 1, -1, -1)
 
     def get_at_index(self, index: int) -> object:
         """
@@ -86,9 +299,14 @@ class DynamicArray:
     def __getitem__(self, index) -> object:
         """
         Same functionality as get_at_index() method above,
-        but called using array[index] syntax
-        DO NOT CHANGE THIS METHOD IN ANY WAY
+        but called using array[index] syntax.
+        A slice object (array[start:stop]) returns a DynamicArrayView instead
         """
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self._size)
+            if step != 1:
+                raise DynamicArrayException("Only contiguous slices are supported")
+            return DynamicArrayView(self, start, max(stop - start, 0))
         return self.get_at_index(index)
 
     def __setitem__(self, index, value) -> None:
@@ -120,6 +338,30 @@ class DynamicArray:
         """
         return self._capacity
 
+    def get_typecode(self) -> str:
+        """
+        Return the typecode of a typed array, or None when values are stored as regular objects
+        """
+        return self._typecode
+
+    def get_policy(self) -> GrowthPolicy:
+        """
+        Return the growth policy of the array
+        """
+        return self._policy
+
+    def set_policy(self, policy: GrowthPolicy) -> None:
+        """
+        Changes the growth policy of the array (None for the default), it applies from the next resize on
+        """
+        self._policy = policy or DEFAULT_POLICY
+
+    def get_backend(self) -> str:
+        """
+        Return the name of the storage backend (see __init__), or "mapped" for a file backed array
+        """
+        return self._backend
+
     def print_da_variables(self) -> None:
         """
         Print information contained in the dynamic array.
@@ -138,27 +380,160 @@ class DynamicArray:
         """
         if new_capacity <= 0 or new_capacity < self._size:
             return
-        # creates new array with the new size
-        new_arr = StaticArray(new_capacity)
-        for i in range(self._size):
-            new_arr.set(i, self.get_at_index(i))
+        if isinstance(self._data, MappedArray):
+            # a file backed array grows (or shrinks) the file in place, nothing is copied
+            self._data.resize(new_capacity)
+            self._capacity = new_capacity
+            return
+        # creates new array with the new size and copies the values over as one block
+        new_arr = self._new_storage(new_capacity)
+        _move_block(self._data, 0, new_arr, 0, self._size)
         # sets the data and capacity in the dynamic array equal to the new values
         self._data = new_arr
         self._capacity = new_capacity
 
+    def reserve(self, capacity: int) -> None:
+        """
+        Makes sure the array can hold at least capacity values without resizing again, with a single resize to
+        exactly that capacity. Removing values may still shrink the array unless the policy disables auto_shrink
+
+        :param capacity: the number of values the array has to be able to hold
+        """
+        if capacity > self._capacity:
+            self.resize(capacity)
+
+    def shrink_to_fit(self) -> None:
+        """
+        Releases the unused capacity, resizing the array to exactly its size (or a single slot when empty)
+        """
+        if self._capacity > max(self._size, 1):
+            self.resize(max(self._size, 1))
+
+    def flush(self) -> None:
+        """
+        Writes the values and the length of a file backed array (see mapped()) back to its file
+        """
+        if not isinstance(self._data, MappedArray):
+            raise DynamicArrayException("Only file backed arrays can be flushed")
+        self._data.flush(self._size)
+
+    def close(self) -> None:
+        """
+        Flushes a file backed array (see mapped()) and closes its file. The array cannot be used afterwards
+        """
+        if not isinstance(self._data, MappedArray):
+            raise DynamicArrayException("Only file backed arrays can be closed")
+        self._data.close(self._size)
+
+    def dump(self, fp) -> None:
+        """
+        Writes the array to a binary file opened for writing. Typed values are written as one raw block of
+        bytes, other values are pickled in batches of DUMP_BATCH. load() reads the array back, on the same storage
+        backend (a file backed array is loaded into memory)
+
+        :param fp: a binary file object (or anything else with a write() method taking bytes)
+        """
+        typecode = (self._typecode or "\0").encode()
+        itemsize = array(self._typecode).itemsize if self._typecode else 0
+        backend = b"" if self._backend == "mapped" else self._backend.encode()
+        fp.write(_DUMP_HEADER.pack(_DUMP_MAGIC, _DUMP_VERSION, typecode, itemsize, sys.byteorder == "big",
+                                   self._size, self._capacity))
+        fp.write(bytes([len(backend)]) + backend)
+        if self._typecode is not None:
+            fp.write(self._data.buffer()[:self._size])
+            return
+        for start in range(0, self._size, DUMP_BATCH):
+            pickle.dump(self._values(start, min(start + DUMP_BATCH, self._size)), fp, pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, fp) -> "DynamicArray":
+        """
+        Reads an array written by dump() from a binary file, restoring its typecode, capacity and storage backend
+        (which has to be registered in this process). Raw typed values written on a machine with the other byte
+        order are swapped. A dump that ends early raises DynamicArrayException("The dump is truncated")
+
+        :param fp: a binary file object positioned at the start of a dump
+
+        :return: a new dynamic array holding the dumped values
+        """
+        header = fp.read(_DUMP_HEADER.size)
+        if len(header) != _DUMP_HEADER.size or header[:4] != _DUMP_MAGIC:
+            raise DynamicArrayException("Not a DynamicArray dump")
+        _, version, typecode, itemsize, big_endian, size, capacity = _DUMP_HEADER.unpack(header)
+        if version not in (1, _DUMP_VERSION):
+            raise DynamicArrayException(f"Unsupported DynamicArray dump version {version}")
+        backend = None
+        if version >= 2:
+            length = fp.read(1)
+            name = fp.read(length[0]) if length else b""
+            if not length or len(name) != length[0]:
+                raise DynamicArrayException("The dump is truncated")
+            backend = name.decode() or None
+
+        if typecode == b"\0":
+            arr = cls(backend=backend)
+            arr.resize(capacity)
+            try:
+                while arr._size < size:
+                    arr.extend(pickle.load(fp))
+            except (EOFError, pickle.UnpicklingError) as error:
+                raise DynamicArrayException("The dump is truncated") from error
+            return arr
+
+        values = array(typecode.decode())
+        if values.itemsize != itemsize:
+            raise DynamicArrayException("The dump was written with a different item size")
+        data = fp.read(size * itemsize)
+        if len(data) != size * itemsize:
+            raise DynamicArrayException("The dump is truncated")
+        values.frombytes(data)
+        if big_endian != (sys.byteorder == "big"):
+            values.byteswap()
+        if backend not in (None, default_backend(values.typecode)):
+            arr = cls(typecode=values.typecode, backend=backend)
+            arr.resize(capacity)
+            arr.extend(values)
+            return arr
+        # the unused capacity is restored as zeros, like a freshly created TypedArray
+        values.frombytes(bytes((capacity - size) * itemsize))
+        return cls._from_storage(TypedArray.wrap(values), size)
+
     def append(self, value: object) -> None:
         """
-        adds a new value to the array (appending it) and if the array is too small doubles the size of the array
+        adds a new value to the array (appending it) and if the array is too small grows the array, by doubling
+        its size unless the growth policy says otherwise
 
         :param value: an object being added to the array
         """
-        # doubles the size of the array if it is full
+        # grows the array if it is full
         if self._capacity == self._size:
-            self.resize(self._capacity * 2)
+            self.resize(self._policy.grow(self._capacity, self._size + 1))
+        elif isinstance(self._data, EmptyStorage):
+            self._allocate()
         # adds the new value
         self._data.set(self._size, value)
         self._size += 1
 
+    def extend(self, values) -> None:
+        """
+        Appends every value of an iterable to the end of the array. When the number of values is known up front
+        the array is resized at most once, to the same capacity repeated doubling would have reached
+
+        :param values: an iterable (list, DynamicArray, generator...) of the values being appended
+        """
+        if not isinstance(values, DynamicArray):
+            try:
+                len(values)
+            except TypeError:
+                # the length is unknown (e.g. a generator) so the values have to be appended one at a time
+                for value in values:
+                    self.append(value)
+                return
+
+        block, count = self._as_block(values)
+        self._grow_to_fit(self._size + count)
+        _move_block(block, 0, self._data, self._size, count)
+        self._size += count
 
     def insert_at_index(self, index: int, value: object) -> None:
         """
@@ -169,11 +544,12 @@ class DynamicArray:
         """
         if index < 0 or index > self._size:
             raise DynamicArrayException("Index is not Valid")
-        if self._capacity == self._size:
-            self.resize(self._capacity * 2)
-        # shifts all the values to the right by going right to left and moving the over one
-        for i in range(self._size, index, -1):
-            self._data.set(i, self.get_at_index(i - 1))
+        if self._typecode is not None:
+            # validates the value before anything is shifted
+            self._data.validate(value)
+        self._grow_to_fit(self._size + 1)
+        # shifts all the values after the index one to the right as a single block
+        _move_block(self._data, index, self._data, index + 1, self._size - index)
         # adds the new value at the inputed index
         self._data.set(index, value)
         self._size += 1
@@ -186,14 +562,65 @@ class DynamicArray:
         """
         if index < 0 or index >= self._size:
             raise DynamicArrayException("Index is not Valid")
-        # checks if the array is less than 1/4 filled and if the capacity is more than 10
-        if self._size < self._capacity / 4 and self._capacity > 10:
-            new_capacity = max(self._size * 2, 10)
-            self.resize(new_capacity)
-        # removes the value at the inputted index and shift all other values to the left
-        for i in range(index, self._size - 1):
-            self._data.set(i, self.get_at_index(i + 1))
+        # the growth policy decides whether to shrink (by default when less than 1/4 filled with a capacity above 10),
+        # judged by the size before the removal
+        new_capacity = self._policy.shrink(self._capacity, self._size)
+        # removes the value at the inputted index and shift all other values to the left as a single block
+        _move_block(self._data, index + 1, self._data, index, self._size - index - 1)
         self._size -= 1
+        # shrinking after the shift means the resize copies one value less
+        if new_capacity is not None:
+            self.resize(new_capacity)
+
+    def insert_many(self, index: int, values) -> None:
+        """
+        Inserts several values starting at a specified index, shifting the values already there to the right once
+        for the whole batch
+
+        :param index: an integer that represents the location the first new value is going
+        :param values: an iterable of the objects being added to the array, in order
+        """
+        if index < 0 or index > self._size:
+            raise DynamicArrayException("Index is not Valid")
+        block, count = self._as_block(values)
+        if count == 0:
+            return
+        self._grow_to_fit(self._size + count)
+        # opens a gap for the whole batch with one shift
+        _move_block(self._data, index, self._data, index + count, self._size - index)
+        _move_block(block, 0, self._data, index, count)
+        self._size += count
+
+    def remove_range(self, start_index: int, count: int) -> None:
+        """
+        Removes a block of values starting at the inputted index, shifting the values after it to the left once
+
+        :param start_index: the index of the first value being removed
+        :param count: the number of values being removed
+        """
+        if start_index < 0 or count < 0 or start_index + count > self._size:
+            raise DynamicArrayException("Index is not Valid")
+        if count == 0:
+            return
+        _move_block(self._data, start_index + count, self._data, start_index, self._size - start_index - count)
+        self._size -= count
+        # asks the growth policy whether to shrink now that the values are removed
+        new_capacity = self._policy.shrink(self._capacity, self._size)
+        if new_capacity is not None:
+            self.resize(new_capacity)
+
+    def _grow_to_fit(self, needed: int) -> None:
+        """
+        Grows the capacity as the growth policy says (doubling by default), with a single resize, until the array
+        can hold the needed number of values
+
+        :param needed: the number of values the array has to be able to hold
+        """
+        if needed <= self._capacity:
+            if needed > self._size:
+                self._allocate()
+            return
+        self.resize(self._policy.grow(self._capacity, needed))
 
 
     def slice(self, start_index: int, size: int) -> "DynamicArray":
@@ -208,35 +635,77 @@ class DynamicArray:
         if start_index < 0 or size < 0 or start_index >= self._size or start_index + size > self._size:
             raise DynamicArrayException("Index is not Valid")
 
-        slice_arr = DynamicArray()
-        for i in range(size):
-            # adds the values in the slice from the old array to the new one by appending it to the end of the new one
-            slice_arr.append(self.get_at_index(start_index + i))
+        slice_arr = self._derived(self._typecode)
+        # copies the values in the slice from the old array to the new one as a single block
+        slice_arr._grow_to_fit(size)
+        _move_block(self._data, start_index, slice_arr._data, 0, size)
+        slice_arr._size = size
         return slice_arr
 
-    def map(self, map_func) -> "DynamicArray":
+    def _copy_exact(self, start_index: int, size: int) -> "DynamicArray":
+        """
+        Same as slice() for a non-empty range, but the new array's capacity is exactly size, for callers that know
+        the copy will not grow
+        """
+        copy_arr = self._derived(self._typecode)
+        copy_arr.resize(size)
+        _move_block(self._data, start_index, copy_arr._data, 0, size)
+        copy_arr._size = size
+        return copy_arr
+
+    def view(self, start_index: int, size: int) -> "DynamicArrayView":
+        """
+        Creates a window over part of the array without copying it. The view shares this array's storage, so
+        reads and writes through it go straight to this array
+
+        :param start_index: an integer that represents where the window starts
+        :param size: an integer that represents the number of elements in the window
+
+        :return: A DynamicArrayView over the given range
+        """
+        if start_index < 0 or size < 0 or start_index >= self._size or start_index + size > self._size:
+            raise DynamicArrayException("Index is not Valid")
+        return DynamicArrayView(self, start_index, size)
+
+    def map(self, map_func, vectorize: bool = False) -> "DynamicArray":
         """
         Applies a map function to every element in an array and saves it to a new Dynamic array
 
+        Typed numeric arrays are mapped with a single NumPy call (when NumPy is installed) if map_func is a NumPy
+        ufunc, or if vectorize is True and map_func works element-wise on a whole NumPy array. The result is then
+        a typed array. Otherwise map_func is called once per element
+
         :param map_func: a function that applies some type of math formula to inputed integer
+        :param vectorize: allows calling map_func once on the whole array instead of once per element
 
         :return: a new dynamic array with the map function applied to every element.
         """
-        map_arr = DynamicArray()
+        vectorized = vector_map(self._data, self._size, map_func, vectorize)
+        if vectorized is not None:
+            return DynamicArray._from_storage(*vectorized)
+        map_arr = self._derived()
         for i in range(self._size):
             # applies the map function to every element in the original array and appends it to the map_arr
             map_arr.append(map_func(self.get_at_index(i)))
         return map_arr
 
-    def filter(self, filter_func) -> "DynamicArray":
+    def filter(self, filter_func, vectorize: bool = False) -> "DynamicArray":
         """
         Filters through an array and saves values that match the filter to a new Dynamic array
 
+        With vectorize set on a typed numeric array (and NumPy installed) filter_func is called once on the whole
+        array and has to return a boolean mask, e.g. lambda x: x > 10. If it cannot, the filter falls back to
+        calling filter_func once per element
+
         :param filter_func: a function that checks if an element matches the filter(returns true if it does)
+        :param vectorize: allows calling filter_func once on the whole array instead of once per element
 
         :return: a new dynamic array with only elements that the filter_func returned true to
         """
-        filter_arr = DynamicArray()
+        vectorized = vector_filter(self._data, self._size, filter_func, vectorize)
+        if vectorized is not None:
+            return DynamicArray._from_storage(*vectorized)
+        filter_arr = self._derived(self._typecode)
         for i in range(self._size):
             # applies the map function to every element in the original array and appends it to the map_arr
             if filter_func(self.get_at_index(i)):
@@ -247,6 +716,9 @@ class DynamicArray:
         """
         Applied the reduce function to an array and returns the value of the function
 
+        Common operations (operator.add, operator.mul, min, max) on typed numeric arrays are computed with NumPy
+        when it is installed, giving the same result as the loop
+
         :param reduce_func: represents the function of how all the elements will be combined
         :param initializer: Represents the first integer to be considered in the reduce_func (set to none on default)
 
@@ -254,6 +726,9 @@ class DynamicArray:
         """
         if self._size == 0:
             return initializer
+        vectorized = vector_reduce(self._data, self._size, reduce_func, initializer)
+        if vectorized is not NOT_VECTORIZED:
+            return vectorized
         reduce_result = initializer
         index = 0
         # checks if the there is an initializer
@@ -265,6 +740,356 @@ class DynamicArray:
             reduce_result = reduce_func(reduce_result, self.get_at_index(i))
         return reduce_result
 
+    def lazy(self) -> "LazyPipeline":
+        """
+        Starts a lazy map / filter / reduce pipeline over the array, see LazyPipeline
+        """
+        return LazyPipeline(self)
+
+    def _values(self, start: int, stop: int):
+        """
+        Copies the values from start up to (not including) stop out of the storage, as a compact array.array for
+        typed arrays and as a list otherwise
+        """
+        if isinstance(self._data, (TypedArray, ListArray)):
+            return self._data.block(start, stop)
+        data = self._data
+        return [data[i] for i in range(start, stop)]
+
+    def _chunks(self, workers: int, chunksize: int) -> list:
+        """
+        Splits the array into consecutive chunks of values for the worker processes
+        """
+        if chunksize is None:
+            # a few chunks per worker keeps the workers busy when some chunks are slower than others
+            chunksize = -(-self._size // (workers * 4))
+        if chunksize <= 0:
+            raise DynamicArrayException("Chunk size must be positive")
+        return [self._values(start, min(start + chunksize, self._size))
+                for start in range(0, self._size, chunksize)]
+
+    def parallel_map(self, map_func, workers: int = None, chunksize: int = None) -> "DynamicArray":
+        """
+        Same result as map(), but the array is split into chunks that are mapped in a pool of worker processes and
+        joined back together in order. Arrays smaller than PARALLEL_THRESHOLD (or a single worker) are mapped
+        serially. map_func and the values have to be picklable, so map_func must be a module level function
+
+        :param map_func: a function that is applied to every element
+        :param workers: the number of worker processes (defaults to the number of CPUs)
+        :param chunksize: the number of elements sent to a worker at a time
+
+        :return: a new dynamic array with the map function applied to every element.
+        """
+        workers = workers or os.cpu_count() or 1
+        if workers == 1 or self._size < PARALLEL_THRESHOLD:
+            return self.map(map_func)
+        # imported here because concurrent.futures pulls in multiprocessing, which slows down importing the module
+        from concurrent.futures import ProcessPoolExecutor
+        map_arr = self._derived()
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            chunks = self._chunks(workers, chunksize)
+            # results come back in the order of the chunks
+            for result in pool.map(_map_chunk, [map_func] * len(chunks), chunks):
+                map_arr.extend(result)
+        return map_arr
+
+    def parallel_reduce(self, reduce_func, initializer=None, workers: int = None, chunksize: int = None) -> object:
+        """
+        Same result as reduce() for an associative reduce_func: every chunk is reduced in a worker process and the
+        partial results are then combined in order, starting from the initializer. Arrays smaller than
+        PARALLEL_THRESHOLD (or a single worker) are reduced serially. reduce_func and the values have to be
+        picklable, so reduce_func must be a module level function
+
+        :param reduce_func: an associative function of how two elements are combined
+        :param initializer: the first value considered by the reduce_func (set to none on default)
+        :param workers: the number of worker processes (defaults to the number of CPUs)
+        :param chunksize: the number of elements sent to a worker at a time
+
+        :return: an object that represents the value of all the elements being combined using the reduce_func
+        """
+        workers = workers or os.cpu_count() or 1
+        if workers == 1 or self._size < PARALLEL_THRESHOLD:
+            return self.reduce(reduce_func, initializer)
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            chunks = self._chunks(workers, chunksize)
+            partials = list(pool.map(_reduce_chunk, [reduce_func] * len(chunks), chunks))
+        reduce_result = initializer
+        index = 0
+        if initializer is None:
+            reduce_result = partials[0]
+            index = 1
+        for i in range(index, len(partials)):
+            reduce_result = reduce_func(reduce_result, partials[i])
+        return reduce_result
+
+
+class DynamicArrayView:
+    """
+    Zero-copy window over a range of a DynamicArray, created by DynamicArray.view() or array[start:stop]
+
+    The view keeps a reference to its parent array (not to the parent's storage), so it stays valid when the
+    parent resizes: a window always refers to the parent's current positions start .. start + size - 1. If the
+    parent shrinks so that the window no longer fits, every access through the view raises DynamicArrayException
+    """
+    __slots__ = ("_parent", "_start", "_size")
+
+    def __init__(self, parent: DynamicArray, start_index: int, size: int) -> None:
+        """
+        Initialize a view over parent[start_index:start_index + size]
+        """
+        self._parent = parent
+        self._start = start_index
+        self._size = size
+
+    def __str__(self) -> str:
+        """
+        Return content of the view in human-readable form
+        """
+        self._check_window()
+        data = self._parent._data
+        out = "DYN_ARR_VIEW Start/Size: " + str(self._start) + "/" + str(self._size) + ' ['
+        out += ', '.join([str(data[self._start + i]) for i in range(self._size)])
+        return out + ']'
+
+    def __iter__(self):
+        """
+        Iterates over the values in the window
+        """
+        self._check_window()
+        return _iterate(self._parent, self._start, self._start + self._size, 1)
+
+    def __reversed__(self):
+        """
+        Iterates over the values in the window from the last to the first
+        """
+        self._check_window()
+        return _iterate(self._parent, self._start + self._size - 1, self._start - 1, -1)
+
+    def _check_window(self) -> None:
+        """
+        Raises DynamicArrayException if the parent array no longer covers the whole window
+        """
+        if self._start + self._size > self._parent._size:
+            raise DynamicArrayException("View is outside of the parent array")
+
+    def length(self) -> int:
+        """
+        Return number of elements in the view
+        """
+        return self._size
+
+    def is_empty(self) -> bool:
+        """
+        Return True if the view is empty / False otherwise
+        """
+        return self._size == 0
+
+    def get_at_index(self, index: int) -> object:
+        """
+        Return value from given index position of the view
+        Invalid index raises DynamicArrayException
+        """
+        if index < 0 or index >= self._size:
+            raise DynamicArrayException
+        self._check_window()
+        return self._parent._data[self._start + index]
+
+    def set_at_index(self, index: int, value: object) -> None:
+        """
+        Store value at given index of the view, which writes it into the parent array
+        Invalid index raises DynamicArrayException
+        """
+        if index < 0 or index >= self._size:
+            raise DynamicArrayException
+        self._check_window()
+        self._parent._data[self._start + index] = value
+
+    def __getitem__(self, index) -> object:
+        """
+        Same functionality as get_at_index() method above, a slice object returns a narrower view
+        """
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self._size)
+            if step != 1:
+                raise DynamicArrayException("Only contiguous slices are supported")
+            return DynamicArrayView(self._parent, self._start + start, max(stop - start, 0))
+        return self.get_at_index(index)
+
+    def __setitem__(self, index, value) -> None:
+        """
+        Same functionality as set_at_index() method above
+        """
+        self.set_at_index(index, value)
+
+    def view(self, start_index: int, size: int) -> "DynamicArrayView":
+        """
+        Creates a narrower window inside this view, sharing the same parent array
+
+        :param start_index: an integer that represents where the window starts, relative to this view
+        :param size: an integer that represents the number of elements in the window
+
+        :return: A DynamicArrayView over the given range
+        """
+        if start_index < 0 or size < 0 or start_index >= self._size or start_index + size > self._size:
+            raise DynamicArrayException("Index is not Valid")
+        return DynamicArrayView(self._parent, self._start + start_index, size)
+
+    def to_array(self) -> DynamicArray:
+        """
+        Copies the values in the window into a new, independent DynamicArray
+        """
+        self._check_window()
+        if self._size == 0:
+            return self._parent._derived(self._parent.get_typecode())
+        return self._parent.slice(self._start, self._size)
+
+    def map(self, map_func) -> DynamicArray:
+        """
+        Applies a map function to every element in the window and saves the results to a new Dynamic array
+
+        :param map_func: a function that is applied to every element
+
+        :return: a new dynamic array with the map function applied to every element of the window
+        """
+        self._check_window()
+        data = self._parent._data
+        map_arr = self._parent._derived()
+        for i in range(self._start, self._start + self._size):
+            map_arr.append(map_func(data[i]))
+        return map_arr
+
+    def filter(self, filter_func) -> DynamicArray:
+        """
+        Saves the elements of the window that match the filter to a new Dynamic array
+
+        :param filter_func: a function that returns true for the elements being kept
+
+        :return: a new dynamic array with only elements that the filter_func returned true to
+        """
+        self._check_window()
+        data = self._parent._data
+        filter_arr = self._parent._derived(self._parent.get_typecode())
+        for i in range(self._start, self._start + self._size):
+            if filter_func(data[i]):
+                filter_arr.append(data[i])
+        return filter_arr
+
+    def reduce(self, reduce_func, initializer=None) -> object:
+        """
+        Applies the reduce function to the elements of the window, without copying them
+
+        :param reduce_func: represents the function of how all the elements will be combined
+        :param initializer: the first value considered by the reduce_func (set to none on default)
+
+        :return: an object that represents the value of all the elements being combined using the reduce_func
+        """
+        if self._size == 0:
+            return initializer
+        self._check_window()
+        data = self._parent._data
+        index = self._start
+        reduce_result = initializer
+        if initializer is None:
+            reduce_result = data[index]
+            index += 1
+        for i in range(index, self._start + self._size):
+            reduce_result = reduce_func(reduce_result, data[i])
+        return reduce_result
+
+    def lazy(self) -> "LazyPipeline":
+        """
+        Starts a lazy map / filter / reduce pipeline over the window, see LazyPipeline
+        """
+        return LazyPipeline(self)
+
+
+class LazyPipeline:
+    """
+    Lazy map / filter / take pipeline over a DynamicArray (or a view), created by array.lazy()
+
+    Adding a stage only records it and returns a new pipeline, nothing is computed until the pipeline is consumed
+    by reduce(), collect() or a for loop. All stages are then fused into a single pass over the source, so no
+    intermediate arrays are created and take() stops reading the source as soon as enough values are produced:
+
+        arr.lazy().map(f).filter(g).take(10).reduce(h)
+    """
+
+    def __init__(self, source, stages: tuple = ()) -> None:
+        """
+        Initialize a pipeline reading from source and applying the recorded stages in order
+        """
+        self._source = source
+        self._stages = stages
+
+    def _then(self, kind: str, arg) -> "LazyPipeline":
+        """
+        Returns a new pipeline with one more stage, leaving this one unchanged so it can be reused
+        """
+        return LazyPipeline(self._source, self._stages + ((kind, arg),))
+
+    def map(self, map_func) -> "LazyPipeline":
+        """
+        Adds a stage that applies map_func to every value
+        """
+        return self._then("map", map_func)
+
+    def filter(self, filter_func) -> "LazyPipeline":
+        """
+        Adds a stage that keeps only the values filter_func returns true for
+        """
+        return self._then("filter", filter_func)
+
+    def take(self, count: int) -> "LazyPipeline":
+        """
+        Adds a stage that stops the pipeline after count values have been produced
+        """
+        if count < 0:
+            raise DynamicArrayException("Count must not be negative")
+        return self._then("take", count)
+
+    def __iter__(self):
+        """
+        Runs the pipeline, producing the values one at a time
+        """
+        values = iter(self._source)
+        # chains the built-in lazy iterators, so every value goes through all of the stages before the next is read
+        for kind, arg in self._stages:
+            if kind == "map":
+                values = map(arg, values)
+            elif kind == "filter":
+                values = filter(arg, values)
+            else:
+                values = islice(values, arg)
+        return values
+
+    def reduce(self, reduce_func, initializer=None) -> object:
+        """
+        Runs the pipeline and combines the values it produces, with the same rules as DynamicArray.reduce()
+
+        :param reduce_func: represents the function of how all the values will be combined
+        :param initializer: the first value considered by the reduce_func (set to none on default)
+
+        :return: the combined value, or the initializer if the pipeline produced nothing
+        """
+        values = iter(self)
+        reduce_result = initializer
+        if initializer is None:
+            reduce_result = next(values, None)
+        for value in values:
+            reduce_result = reduce_func(reduce_result, value)
+        return reduce_result
+
+    def collect(self, typecode: str = None) -> DynamicArray:
+        """
+        Runs the pipeline and stores the values it produces in a new Dynamic array
+
+        :param typecode: optional typecode for compact numeric storage of the results
+
+        :return: a new dynamic array holding the results
+        """
+        return DynamicArray.from_iterable(self, typecode)
+
 
 def chunk(arr: DynamicArray) -> "DynamicArray":
     """
@@ -277,21 +1102,124 @@ def chunk(arr: DynamicArray) -> "DynamicArray":
     # checks if the array is empty and ends the function early if it is
     if arr.length() == 0:
         return arr
+    size = arr.length()
+    data = arr._raw()
+    # finds where every run starts first, so the result and each run can be allocated once at their exact size
+    starts = [0]
+    for i in range(1, size):
+        # checks if the two elements are non-descending
+        if not data[i] >= data[i - 1]:
+            starts.append(i)
+    starts.append(size)
+
     chunk_arr = DynamicArray()
-    current_chunk = DynamicArray()
-    current_chunk.append(arr.get_at_index(0))
+    chunk_arr.resize(len(starts) - 1)
+    for i in range(len(starts) - 1):
+        chunk_arr.append(arr._copy_exact(starts[i], starts[i + 1] - starts[i]))
+    return chunk_arr
 
-    for i in range(1, arr.length()):
-        # checks if the two elements are non-descending
-        if arr.get_at_index(i) >= arr.get_at_index(i - 1):
-            current_chunk.append(arr.get_at_index(i))
+
+def natural_merge_sort(arr: DynamicArray, ascending: bool = True) -> dict:
+    """
+    Sorts a DynamicArray in place with a stable, adaptive natural merge sort. The array is first split into the
+    runs that are already in order (the non-descending runs chunk() finds, for an ascending sort). Runs that are
+    strictly in the opposite order are reversed in place, then neighbouring runs are merged pass by pass. Presorted
+    (or reverse sorted) input is a single run and costs O(n), k runs cost O(n log k)
+
+    :param arr: a dynamic array being sorted
+    :param ascending: sorts in non-descending order when True, in non-ascending order when False
+
+    :return: a dictionary with statistics about the runs found and the merge passes needed
+    """
+    stats = {"runs": 0, "reversed_runs": 0, "shortest_run": 0, "longest_run": 0, "merge_passes": 0}
+    size = arr.length()
+    if size == 0:
+        return stats
+    data = arr._data
+
+    # finds the runs, storing the index each one starts at (plus the size, as the end of the last run)
+    bounds = DynamicArray()
+    start = 0
+    while start < size:
+        end = start + 1
+        if end < size and _comes_before(data[end], data[start], ascending):
+            # a run strictly in the wrong order is reversed, which keeps the sort stable since it has no equal values
+            while end + 1 < size and _comes_before(data[end + 1], data[end], ascending):
+                end += 1
+            end += 1
+            _reverse_block(data, start, end)
+            stats["reversed_runs"] += 1
         else:
-            chunk_arr.append(current_chunk)
-            current_chunk = DynamicArray()
-            # makes sure the new array starts with the next index and doesn't get removed
-            current_chunk.append(arr.get_at_index(i))
-    chunk_arr.append(current_chunk)
-    return chunk_arr
+            while end < size and not _comes_before(data[end], data[end - 1], ascending):
+                end += 1
+        run_length = end - start
+        if stats["runs"] == 0 or run_length < stats["shortest_run"]:
+            stats["shortest_run"] = run_length
+        stats["longest_run"] = max(stats["longest_run"], run_length)
+        stats["runs"] += 1
+        bounds.append(start)
+        start = end
+    bounds.append(size)
+
+    # merges neighbouring runs until a single run is left
+    while bounds.length() > 2:
+        merged = DynamicArray()
+        run_count = bounds.length() - 1
+        for i in range(0, run_count - 1, 2):
+            _merge_runs(data, bounds[i], bounds[i + 1], bounds[i + 2], ascending)
+            merged.append(bounds[i])
+        if run_count % 2 == 1:
+            merged.append(bounds[run_count - 1])
+        merged.append(size)
+        bounds = merged
+        stats["merge_passes"] += 1
+    return stats
+
+
+def _comes_before(first: object, second: object, ascending: bool) -> bool:
+    """
+    Return True if first has to be placed strictly before second in the sorted order
+    """
+    return first < second if ascending else second < first
+
+
+def _reverse_block(data, start: int, end: int) -> None:
+    """
+    Reverses the values in data from start up to (not including) end, in place
+    """
+    end -= 1
+    while start < end:
+        data[start], data[end] = data[end], data[start]
+        start += 1
+        end -= 1
+
+
+def _merge_runs(data, low: int, mid: int, high: int, ascending: bool) -> None:
+    """
+    Stable merge of the sorted runs data[low:mid] and data[mid:high]. Only the left run is copied out, the merged
+    values are written back from low upwards, which never overwrites a value of the right run that is still needed
+    """
+    # the runs are already in order when the first value of the right run does not have to come before the last
+    # value of the left run, which makes merging presorted runs O(1)
+    if not _comes_before(data[mid], data[mid - 1], ascending):
+        return
+    left = [data[i] for i in range(low, mid)]
+    left_index = 0
+    right_index = mid
+    dest = low
+    while left_index < len(left) and right_index < high:
+        # takes from the right run only when it is strictly first, so equal values keep their order
+        if _comes_before(data[right_index], left[left_index], ascending):
+            data[dest] = data[right_index]
+            right_index += 1
+        else:
+            data[dest] = left[left_index]
+            left_index += 1
+        dest += 1
+    while left_index < len(left):
+        data[dest] = left[left_index]
+        left_index += 1
+        dest += 1
 
 
 def find_mode(arr: DynamicArray) -> tuple[DynamicArray, int]:
@@ -337,6 +1265,87 @@ def find_mode(arr: DynamicArray) -> tuple[DynamicArray, int]:
     return mode_arr, max_freq
 
 
+def find_mode_unsorted(arr) -> tuple[DynamicArray, int]:
+    """
+    Same result as find_mode(), but the input does not have to be sorted: the values are counted in a hash table
+    in a single O(n) pass. The values must be hashable
+
+    :param arr: a dynamic array (or any iterable) that is being examined
+
+    :return: a tuple with the values that appear the most frequently, in order of first appearance, and the number
+    of times they appear
+    """
+    counts = {}
+    for value in arr:
+        counts[value] = counts.get(value, 0) + 1
+    return _top_counts(counts)
+
+
+def heavy_hitters(iterable, epsilon: float = 0.01) -> tuple[DynamicArray, int]:
+    """
+    Finds the frequent values of a stream that is too large to store, with the Misra-Gries summary. At most
+    ceil(1 / epsilon) counters are kept, so memory does not depend on the length n of the stream. Every value that
+    appears more than epsilon * n times is guaranteed to be reported, and each reported count is at most
+    epsilon * n below the true count (it is never above it)
+
+    :param iterable: the values being examined, e.g. a generator; they must be hashable
+    :param epsilon: the allowed error, as a fraction of the stream length (0 < epsilon < 1)
+
+    :return: a tuple with a DynamicArray of (value, estimated count) pairs, largest count first, and the number
+    of values read from the stream
+    """
+    if not 0 < epsilon < 1:
+        raise DynamicArrayException("Epsilon must be between 0 and 1")
+    capacity = -(-1 // epsilon)
+    counters = {}
+    seen = 0
+    for value in iterable:
+        seen += 1
+        if value in counters:
+            counters[value] += 1
+        elif len(counters) < capacity:
+            counters[value] = 1
+        else:
+            # every counter (and the new value) loses one occurrence, counters that reach zero are dropped
+            for candidate in list(counters):
+                if counters[candidate] == 1:
+                    del counters[candidate]
+                else:
+                    counters[candidate] -= 1
+    pairs = DynamicArray(sorted(counters.items(), key=lambda pair: pair[1], reverse=True))
+    return pairs, seen
+
+
+def stream_mode(iterable, epsilon: float = 0.01) -> tuple[DynamicArray, int]:
+    """
+    Approximate find_mode() for unbounded streams, built on heavy_hitters(). The values with the highest estimated
+    count are returned, which are the true modes whenever the mode's lead over the next value is more than
+    epsilon * n
+
+    :param iterable: the values being examined, e.g. a generator; they must be hashable
+    :param epsilon: the allowed error, as a fraction of the stream length (0 < epsilon < 1)
+
+    :return: a tuple with the approximate modes and their estimated frequency (a lower bound on the true one)
+    """
+    pairs, _ = heavy_hitters(iterable, epsilon)
+    counts = {}
+    for value, count in pairs:
+        counts[value] = count
+    return _top_counts(counts)
+
+
+def _top_counts(counts: dict) -> tuple[DynamicArray, int]:
+    """
+    Return the keys with the highest count (in the dictionary's order) and that count
+    """
+    mode_arr = DynamicArray()
+    max_freq = max(counts.values(), default=0)
+    for value, count in counts.items():
+        if count == max_freq:
+            mode_arr.append(value)
+    return mode_arr, max_freq
+
+
 
 # ------------------- BASIC TESTING -----------------------------------------
 
@@ -605,3 +1614,51 @@ if __name__ == "__main__":
         da.append(case[x])
         mode, frequency = find_mode(da)
         print(f"{da}\nMode: {mode}, Frequency: {frequency}")
+
+    print("\n# find_mode_unsorted example 1")
+    da = DynamicArray(["Fig", "Date", "Apple", "Date", "Fig", "Banana", "Date"])
+    mode, frequency = find_mode_unsorted(da)
+    print(f"{da}\nMode: {mode}, Frequency: {frequency}")
+
+    print("\n# stream_mode example 1")
+    events = (x % 7 if x % 3 else 5 for x in range(100000))
+    mode, frequency = stream_mode(events, epsilon=0.01)
+    print(f"Mode: {mode}, Frequency: {frequency}")
+
+    print("\n# growth policy example 1")
+    da = DynamicArray(policy=GrowthPolicy(factor=1.5, max_step=8, auto_shrink=False))
+    capacities = []
+    for value in range(60):
+        da.append(value)
+        if da.get_capacity() not in capacities:
+            capacities.append(da.get_capacity())
+    print(capacities)
+    da.remove_range(0, 55)
+    print(da)
+    da.shrink_to_fit()
+    print(da)
+    da.reserve(100)
+    print(da)
+
+    print("\n# pickle / copy of empty arrays example 1")
+    import copy
+    for da in [DynamicArray(), DynamicArray(typecode='i'), DynamicArray([1, 3, 5]).filter(lambda x: x % 2 == 0)]:
+        restored = pickle.loads(pickle.dumps(da))
+        duplicate = copy.deepcopy(da)
+        restored.append(1)
+        duplicate.append(2)
+        print(restored, duplicate, da)
+
+    print("\n# load of a truncated dump example 1")
+    import io
+    for da in [DynamicArray(range(10), typecode='q'), DynamicArray(["a", 1, None] * 3)]:
+        checkpoint = io.BytesIO()
+        da.dump(checkpoint)
+        dumped = checkpoint.getvalue()
+        for cut in range(len(dumped)):
+            try:
+                DynamicArray.load(io.BytesIO(dumped[:cut]))
+            except DynamicArrayException:
+                continue
+            raise AssertionError(f"a dump cut after {cut} bytes was loaded")
+        print(f"every cut of a {len(dumped)} byte dump raises DynamicArrayException")
@@ -0,0 +1,82 @@
+# Course: CS261 - Data Structures
+# Description: Growth and shrink policies deciding when a DynamicArray resizes and to what capacity
+
+import math
+
+
+class GrowthPolicyException(ValueError):
+    """
+    Custom exception raised for growth policy settings that do not make sense
+    """
+    pass
+
+
+class GrowthPolicy:
+    """
+    Decides the capacities a DynamicArray resizes to. The default policy is the one DynamicArray always used:
+    double when full, and once fewer than a quarter of the slots are used (and there are more than 10) shrink to
+    twice the size, but never below 10.
+
+    Growing multiplies the capacity by factor, adding at most max_step slots at a time when max_step is set (so
+    very large arrays grow linearly instead of overshooting by millions of slots). Shrinking happens when the
+    array falls below shrink_at of its capacity and leaves it shrink_to full. The gap between the two is the
+    hysteresis band: right after a shrink the array has to lose (shrink_to - shrink_at) of its new capacity
+    before it shrinks again, or fill it before it grows, so alternating adds and removes cannot resize every time
+    """
+    __slots__ = ("factor", "max_step", "shrink_at", "shrink_to", "min_capacity", "auto_shrink")
+
+    def __init__(self, factor: float = 2.0, max_step: int = None, shrink_at: float = 0.25, shrink_to: float = 0.5,
+                 min_capacity: int = 10, auto_shrink: bool = True) -> None:
+        """
+        :param factor: what the capacity is multiplied by when the array is full, more than 1
+        :param max_step: the largest number of slots added by one growth step, None for no limit
+        :param shrink_at: the fill ratio below which the array shrinks
+        :param shrink_to: the fill ratio the array has right after shrinking, more than shrink_at
+        :param min_capacity: automatic shrinking never goes below (or starts at) this capacity
+        :param auto_shrink: False never shrinks automatically, see DynamicArray.shrink_to_fit()
+        """
+        if factor <= 1:
+            raise GrowthPolicyException("The growth factor must be more than 1")
+        if max_step is not None and max_step < 1:
+            raise GrowthPolicyException("The growth step must be at least 1")
+        if not 0 <= shrink_at < shrink_to <= 1:
+            raise GrowthPolicyException("Shrinking needs 0 <= shrink_at < shrink_to <= 1")
+        self.factor = factor
+        self.max_step = max_step
+        self.shrink_at = shrink_at
+        self.shrink_to = shrink_to
+        self.min_capacity = min_capacity
+        self.auto_shrink = auto_shrink
+
+    def __repr__(self) -> str:
+        return (f"GrowthPolicy(factor={self.factor}, max_step={self.max_step}, shrink_at={self.shrink_at}, "
+                f"shrink_to={self.shrink_to}, min_capacity={self.min_capacity}, auto_shrink={self.auto_shrink})")
+
+    def grow(self, capacity: int, needed: int) -> int:
+        """
+        Return the capacity to grow to, applying growth steps until the array can hold the needed number of values
+
+        :param capacity: the current capacity
+        :param needed: the number of values the array has to be able to hold
+        """
+        while capacity < needed:
+            step = max(math.ceil(capacity * (self.factor - 1)), 1)
+            if self.max_step is not None:
+                step = min(step, self.max_step)
+            capacity += step
+        return capacity
+
+    def shrink(self, capacity: int, size: int) -> int:
+        """
+        Return the capacity to shrink to, or None when the array should keep its current capacity
+
+        :param capacity: the current capacity
+        :param size: the number of values in the array
+        """
+        if not self.auto_shrink or capacity <= self.min_capacity or size >= capacity * self.shrink_at:
+            return None
+        return max(math.ceil(size / self.shrink_to), self.min_capacity)
+
+
+# shared by every DynamicArray that is not given its own policy
+DEFAULT_POLICY = GrowthPolicy()
@@ -0,0 +1,314 @@
+# Course: CS261 - Data Structures
+# Description: Opt-in counters for the comparisons, moves and resizes made by DynamicArray and MinHeap
+
+from contextlib import contextmanager
+
+from dynamic_array import DynamicArray, DynamicArrayException, chunk
+from min_heap import MinHeap
+
+
+class Stats:
+    """
+    Counters collected for one instrumented DynamicArray or MinHeap:
+
+    comparisons -- comparisons made by the heap sift kernels
+    moves -- values written into the storage (appends, shifts, sifts)
+    resizes -- times the storage was replaced by one with another capacity
+    copied -- values copied into new storage by those resizes
+    peak_capacity -- the largest capacity the storage had
+
+    Hooks are called as hook(event, stats, details) for every resize, so counters can be forwarded to a metrics
+    system or a profiler as they change
+    """
+
+    def __init__(self) -> None:
+        self.comparisons = 0
+        self.moves = 0
+        self.resizes = 0
+        self.copied = 0
+        self.peak_capacity = 0
+        self._hooks = []
+
+    def __str__(self) -> str:
+        return "STATS " + str(self.as_dict())
+
+    def as_dict(self) -> dict:
+        """
+        Return the current counters as a dictionary, e.g. for exporting them
+        """
+        return {"comparisons": self.comparisons, "moves": self.moves, "resizes": self.resizes,
+                "copied": self.copied, "peak_capacity": self.peak_capacity}
+
+    def reset(self) -> None:
+        """
+        Sets every counter back to zero (the peak capacity is kept)
+        """
+        self.comparisons = self.moves = self.resizes = self.copied = 0
+
+    def add_hook(self, hook) -> None:
+        """
+        Registers a function called as hook(event, stats, details) whenever an event (currently "resize") happens
+        """
+        self._hooks.append(hook)
+
+    def emit(self, event: str, **details) -> None:
+        """
+        Calls every registered hook for an event
+        """
+        for hook in self._hooks:
+            hook(event, self, details)
+
+
+class _Compared:
+    """
+    Stand-in for a value read by a kernel through DynamicArray._raw(), counting every comparison it takes part in.
+    A plain value on the left of a comparison reaches the reflected method (e.g. 3 < x calls x.__gt__(3))
+    """
+    __slots__ = ("value", "stats")
+    __hash__ = None
+
+    def __init__(self, value: object, stats: Stats) -> None:
+        self.value = value
+        self.stats = stats
+
+    def _other(self, other: object) -> object:
+        self.stats.comparisons += 1
+        return other.value if isinstance(other, _Compared) else other
+
+    def __lt__(self, other: object) -> bool:
+        return self.value < self._other(other)
+
+    def __le__(self, other: object) -> bool:
+        return self.value <= self._other(other)
+
+    def __gt__(self, other: object) -> bool:
+        return self.value > self._other(other)
+
+    def __ge__(self, other: object) -> bool:
+        return self.value >= self._other(other)
+
+    def __eq__(self, other: object) -> bool:
+        return self.value == self._other(other)
+
+    def __ne__(self, other: object) -> bool:
+        return self.value != self._other(other)
+
+
+class _CountingStorage:
+    """
+    Wrapper around the storage array of a DynamicArray counting every value written into it. Everything else is
+    passed on to the wrapped storage
+    """
+
+    def __init__(self, storage, stats: Stats) -> None:
+        self.storage = storage
+        self.stats = stats
+
+    def __getattr__(self, name: str):
+        return getattr(self.storage, name)
+
+    def __str__(self) -> str:
+        return str(self.storage)
+
+    def __iter__(self):
+        return iter(self.storage)
+
+    def __getitem__(self, index: int) -> object:
+        return self.storage[index]
+
+    def __setitem__(self, index: int, value: object) -> None:
+        self.stats.moves += 1
+        self.storage[index] = value
+
+    set = __setitem__
+
+
+class _KernelView(_CountingStorage):
+    """
+    The storage as seen by the sift kernels (see DynamicArray._raw()): values read through it count their
+    comparisons, and are unwrapped again when they are written back
+    """
+
+    def __getitem__(self, index: int) -> object:
+        return _Compared(self.storage[index], self.stats)
+
+    def __setitem__(self, index: int, value: object) -> None:
+        self.stats.moves += 1
+        self.storage[index] = value.value if isinstance(value, _Compared) else value
+
+
+class _InstrumentedDynamicArray(DynamicArray):
+    """
+    DynamicArray whose storage is wrapped in a _CountingStorage. Only instrumented instances are switched to
+    this class, so DynamicArray itself carries no counting code at all
+    """
+    __slots__ = ()
+
+    def _raw(self):
+        return _KernelView(self._data.storage, self._data.stats)
+
+    def _unwrapped(self, method, *args) -> None:
+        """
+        Calls a DynamicArray method with the real storage in place, so it sees the exact storage type (and the
+        values it copies are counted as copies rather than moves)
+        """
+        counting = self._data
+        self._data = counting.storage
+        try:
+            method(self, *args)
+        finally:
+            counting.storage = self._data
+            self._data = counting
+
+    def resize(self, new_capacity: int) -> None:
+        old_capacity = self._capacity
+        self._unwrapped(DynamicArray.resize, new_capacity)
+        if self._capacity != old_capacity:
+            stats = self._data.stats
+            stats.resizes += 1
+            stats.copied += self._size
+            stats.peak_capacity = max(stats.peak_capacity, self._capacity)
+            stats.emit("resize", old_capacity=old_capacity, new_capacity=self._capacity, copied=self._size)
+
+    def flush(self) -> None:
+        self._unwrapped(DynamicArray.flush)
+
+    def close(self) -> None:
+        self._unwrapped(DynamicArray.close)
+
+
+class _InstrumentedMinHeap(MinHeap):
+    """
+    MinHeap that keeps its node and key arrays instrumented when they are replaced (build_heap(), clear()).
+    instrument() gives every instrumented heap its own subclass holding its Stats in the stats attribute
+    """
+    __slots__ = ()
+    stats = None
+
+    def _load_keys(self) -> None:
+        MinHeap._load_keys(self)
+        _attach_heap(self, self.stats)
+
+    def clear(self) -> None:
+        MinHeap.clear(self)
+        _attach_heap(self, self.stats)
+
+
+def _attach_array(da: DynamicArray, stats: Stats) -> None:
+    """
+    Instruments a DynamicArray (again) with the given counters
+    """
+    if not isinstance(da._data, _CountingStorage):
+        # the shared empty storage of a new array must not be written through the wrapper
+        da._allocate()
+        da._data = _CountingStorage(da._data, stats)
+    da._data.stats = stats
+    da.__class__ = _InstrumentedDynamicArray
+    stats.peak_capacity = max(stats.peak_capacity, da.get_capacity())
+
+
+def _attach_heap(heap: MinHeap, stats: Stats) -> None:
+    """
+    Instruments the node array and the cached key array of a heap with the same counters
+    """
+    _attach_array(heap._heap, stats)
+    if heap._keys is not None:
+        _attach_array(heap._keys, stats)
+
+
+def instrument(target, hook=None) -> Stats:
+    """
+    Starts counting the comparisons, moves, resizes and copies made by a DynamicArray or MinHeap. Instances that
+    are not instrumented run exactly the same code as before, so instrumentation costs nothing until it is used.
+    While it is on the NumPy and block-copy fast paths are skipped, so every value that moves is counted
+
+    :param target: the DynamicArray or MinHeap being instrumented
+    :param hook: optional function called as hook(event, stats, details), see Stats
+
+    :return: the Stats object the counters are collected in
+    """
+    stats = Stats()
+    if hook is not None:
+        stats.add_hook(hook)
+    if isinstance(target, MinHeap):
+        _attach_heap(target, stats)
+        target.__class__ = type(_InstrumentedMinHeap.__name__, (_InstrumentedMinHeap,),
+                                {"__slots__": (), "stats": stats})
+    elif isinstance(target, DynamicArray):
+        _attach_array(target, stats)
+    else:
+        raise DynamicArrayException("Only a DynamicArray or MinHeap can be instrumented")
+    return stats
+
+
+def uninstrument(target) -> None:
+    """
+    Stops counting for a DynamicArray or MinHeap instrumented with instrument() and restores its fast paths
+    """
+    arrays = [target]
+    if isinstance(target, MinHeap):
+        target.__class__ = MinHeap
+        arrays = [target._heap, target._keys]
+    for da in arrays:
+        if da is not None and isinstance(da._data, _CountingStorage):
+            da._data = da._data.storage
+            da.__class__ = DynamicArray
+
+
+@contextmanager
+def instrumented(target, hook=None):
+    """
+    Context manager form of instrument() / uninstrument(): counts everything done inside the with block
+
+        with instrumented(heap) as stats:
+            heap.remove_min()
+        print(stats.comparisons)
+    """
+    stats = instrument(target, hook)
+    try:
+        yield stats
+    finally:
+        uninstrument(target)
+
+
+# ------------------- BASIC TESTING -----------------------------------------
+
+
+if __name__ == "__main__":
+    import random
+    from min_heap import heapsort
+
+    print("\n# DynamicArray counters")
+    da = DynamicArray()
+    events = []
+    with instrumented(da, hook=lambda event, stats, details: events.append(details)) as stats:
+        for value in range(100):
+            da.append(value)
+        da.insert_at_index(0, -1)
+        for _ in range(95):
+            da.remove_at_index(0)
+    print(stats)
+    print("resizes:", events)
+
+    print("\n# MinHeap counters")
+    random.seed(261)
+    values = random.sample(range(1000), 1000)
+    h = MinHeap(values)
+    with instrumented(h) as stats:
+        for _ in range(100):
+            h.remove_min()
+    print("100 remove_min on 1000 nodes:", stats)
+    h.add(-1)
+    print("after uninstrument:", type(h).__name__, type(h._heap._data).__name__, h.get_min())
+
+    print("\n# chunk on an instrumented array")
+    da = DynamicArray([1, 2, 2, 0, 5, 3, 4])
+    with instrumented(da) as stats:
+        print([str(run) for run in chunk(da)], stats.comparisons)
+
+    print("\n# heapsort counters")
+    for bottom_up in (False, True):
+        da = DynamicArray(values)
+        with instrumented(da) as stats:
+            heapsort(da, bottom_up=bottom_up)
+        print(f"bottom_up={bottom_up}:", stats)
@@ -0,0 +1,261 @@
+# Course: CS261 - Data Structures
+# Description: Fixed size numeric array stored in a memory-mapped file, for data that does not fit in memory
+
+import mmap
+import os
+import struct
+from array import array
+
+from typed_array import TypedArray, TypedArrayException
+
+# every file starts with a header: magic, typecode, item size and the number of values in use
+MAGIC = b"DYNARR\x00\x01"
+_HEADER = struct.Struct("<8s2B6xQ")
+
+# fixed-width typecodes memoryview.cast() understands ('u' and 'w' hold characters, not numbers)
+_MAPPABLE_TYPECODES = frozenset("bBhHiIlLqQfd")
+
+
+class MappedArray(TypedArray):
+    """
+    Fixed size array with the same interface as TypedArray, but storing its values in a file through mmap, so
+    only the pages that are touched are loaded into memory. The file begins with a small header recording the
+    typecode and how many values are in use, which lets an existing file be reopened without reading it.
+
+    Unlike the other storage arrays a MappedArray can change its capacity in place (see resize()), which extends
+    or truncates the file instead of copying the values into a new array
+    """
+
+    def __init__(self, path: str, capacity: int = None, typecode: str = None, readonly: bool = False) -> None:
+        """
+        Opens the file at path, creating it first if it does not exist. A new file needs a typecode and holds
+        capacity values (10 by default); an existing file keeps its own typecode, and its current capacity
+        unless a larger one is asked for
+
+        :param path: the file storing the values
+        :param capacity: the number of values the array can hold
+        :param typecode: the array.array typecode of the values, checked against the header of an existing file
+        :param readonly: maps the file read-only, so any number of processes can share it safely
+        """
+        self._path = path
+        self._readonly = readonly
+        self._mmap = None
+        self._bytes = None
+        self._data = None
+        if os.path.exists(path):
+            self._file = open(path, "rb" if readonly else "r+b")
+            magic, code, itemsize, size = _HEADER.unpack(self._file.read(_HEADER.size))
+            if magic != MAGIC:
+                self._file.close()
+                raise TypedArrayException(f"{path} is not a mapped array file")
+            self._typecode = chr(code)
+            if typecode is not None and typecode != self._typecode:
+                self._file.close()
+                raise TypedArrayException(f"{path} holds '{self._typecode}' values, not '{typecode}'")
+            if itemsize != array(self._typecode).itemsize:
+                self._file.close()
+                raise TypedArrayException(f"{path} was written on a platform with a different item size")
+            self._size = size
+            self._map()
+            if capacity is not None and capacity > self.length():
+                self.resize(capacity)
+            return
+
+        if readonly:
+            raise TypedArrayException(f"{path} does not exist")
+        if typecode is None:
+            raise TypedArrayException(f"A typecode is needed to create {path}")
+        if typecode not in _MAPPABLE_TYPECODES:
+            raise TypedArrayException(f"'{typecode}' values cannot be stored in a mapped array")
+        if capacity is not None and capacity < 1:
+            raise TypedArrayException("Array size must be a positive integer")
+        self._typecode = typecode
+        self._size = 0
+        self._file = open(path, "w+b")
+        self._file.write(_HEADER.pack(MAGIC, ord(typecode), array(typecode).itemsize, 0))
+        self._file.truncate(self._file_length(capacity or 10))
+        self._map()
+
+    def _file_length(self, capacity: int) -> int:
+        """
+        Return the file length needed for a header followed by capacity values
+        """
+        return _HEADER.size + capacity * array(self._typecode).itemsize
+
+    def _map(self) -> None:
+        """
+        Maps the file into memory and exposes the values after the header as a typed memoryview
+        """
+        access = mmap.ACCESS_READ if self._readonly else mmap.ACCESS_WRITE
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=access)
+        self._bytes = memoryview(self._mmap)
+        self._data = self._bytes[_HEADER.size:].cast(self._typecode)
+
+    def _unmap(self) -> None:
+        """
+        Releases the memoryviews and the mapping, which has to happen before the file can change length
+        """
+        if self._mmap is None:
+            return
+        self._data.release()
+        self._bytes.release()
+        self._mmap.close()
+        self._data = self._bytes = self._mmap = None
+
+    def __str__(self) -> str:
+        """
+        Return content of the array in human-readable form
+        """
+        return f"MAPPED_ARR Size: {len(self._data)} '{self._typecode}' {self._data.tolist()}"
+
+    def set(self, index: int, value: object) -> None:
+        """
+        Stores a value at the given index. Invalid indices, values that do not fit the typecode and writes to a
+        read-only array raise TypedArrayException
+        """
+        if self._readonly:
+            raise TypedArrayException(f"{self._path} is open read-only")
+        if index < 0 or index >= len(self._data):
+            raise TypedArrayException("Index out of bounds")
+        try:
+            self._data[index] = value
+        except (TypeError, ValueError) as error:
+            raise TypedArrayException(f"{value!r} cannot be stored in a '{self._typecode}' array") from error
+
+    def block(self, start: int, stop: int) -> array:
+        """
+        Return a copy of the values from start up to (not including) stop as an array.array
+        """
+        values = array(self._typecode)
+        values.frombytes(self._data[start:stop].cast("B"))
+        return values
+
+    @property
+    def path(self) -> str:
+        """
+        Return the path of the file storing the values
+        """
+        return self._path
+
+    @property
+    def size(self) -> int:
+        """
+        Return the number of values in use, as recorded in the header by the last flush()
+        """
+        return self._size
+
+    def resize(self, capacity: int) -> None:
+        """
+        Changes the capacity in place by extending (or truncating) the file and mapping it again. The values
+        already stored are not copied, the file system just adds or drops pages at the end
+
+        :param capacity: the number of values the array can hold
+        """
+        if self._readonly:
+            raise TypedArrayException(f"{self._path} is open read-only")
+        if capacity < 1:
+            raise TypedArrayException("Array size must be a positive integer")
+        self._unmap()
+        self._file.truncate(self._file_length(capacity))
+        self._map()
+
+    def flush(self, size: int = None) -> None:
+        """
+        Records the number of values in use in the header and writes every changed page back to the file
+
+        :param size: the number of values in use (the size recorded by the last flush by default)
+        """
+        if self._readonly:
+            return
+        if size is not None:
+            self._size = size
+        self._bytes[:_HEADER.size] = _HEADER.pack(MAGIC, ord(self._typecode), self._data.itemsize, self._size)
+        self._mmap.flush()
+
+    def close(self, size: int = None) -> None:
+        """
+        Flushes the array (see flush()) and closes the file. The array cannot be used afterwards
+        """
+        if self._mmap is None:
+            return
+        self.flush(size)
+        self._unmap()
+        self._file.close()
+
+
+# ------------------- BASIC TESTING -----------------------------------------
+
+
+def _sum_file(path: str) -> int:
+    """
+    Worker for the sharing example below: maps a file read-only and sums the values in use
+    """
+    shared = MappedArray(path, readonly=True)
+    total = sum(shared.block(0, shared.size))
+    shared.close()
+    return total
+
+
+if __name__ == "__main__":
+    import tempfile
+    import time
+    from concurrent.futures import ProcessPoolExecutor
+    from dynamic_array import DynamicArray
+    from min_heap import MinHeap, heapsort
+
+    folder = tempfile.mkdtemp()
+    path = os.path.join(folder, "values.dat")
+
+    print("\n# file backed DynamicArray example 1")
+    da = DynamicArray.mapped(path, typecode='q')
+    for value in [5, 3, 8, 1, 9, 2]:
+        da.append(value)
+    da.print_da_variables()
+    heapsort(da)
+    print(da)
+    da.close()
+
+    print("\n# reopening an existing file")
+    da = DynamicArray.mapped(path)
+    print(da, da.get_typecode())
+    da.append(0)
+    da.close()
+    print(DynamicArray.mapped(path, readonly=True))
+
+    print("\n# file backed MinHeap example 1")
+    heap_path = os.path.join(folder, "heap.dat")
+    h = MinHeap.mapped(heap_path, typecode='q')
+    for value in [50, 7, 30, 2, 9]:
+        h.add(value)
+    print(h)
+    print(h.remove_min(), h)
+    h.close()
+    h = MinHeap.mapped(heap_path)
+    h.build_heap(DynamicArray([40, 3, 25]))
+    h.add(1)
+    print(h)
+    print(h.remove_min(), h.remove_min(), h)
+    h.close()
+    print(MinHeap.mapped(heap_path, readonly=True))
+
+    print("\n# growth extends the file instead of copying")
+    big_path = os.path.join(folder, "big.dat")
+    da = DynamicArray.mapped(big_path, typecode='d')
+    start = time.perf_counter()
+    da.extend(array('d', range(10 ** 6)))
+    print(f"1,000,000 doubles written in {time.perf_counter() - start:.3f}s, "
+          f"file is {os.path.getsize(big_path):,} bytes, capacity {da.get_capacity()}")
+    da.close()
+    start = time.perf_counter()
+    da = DynamicArray.mapped(big_path)
+    print(f"reopened in {time.perf_counter() - start:.4f}s with length {da.length()}, last value {da[da.length() - 1]}")
+    da.close()
+
+    print("\n# read-only sharing across processes")
+    with ProcessPoolExecutor(max_workers=2) as pool:
+        print(list(pool.map(_sum_file, [path, big_path])))
+
+    try:
+        DynamicArray.mapped(path, readonly=True).append(1)
+    except TypedArrayException as error:
+        print("append on a read-only array:", error)
@@ -5,7 +5,15 @@
 # Due Date: 5/26/2025
 # Description: MinHeap functionality Implementation
 
+import struct
+
 from dynamic_array import *
+from growth import GrowthPolicy
+from vectorized import vector_sort
+
+# MinHeap.dump() header: magic, format version, arity, reverse flag, whether cached keys follow the nodes
+_HEAP_MAGIC = b"MHEP"
+_HEAP_HEADER = struct.Struct("<4sBBBB")
 
 
 class MinHeapException(Exception):
@@ -17,18 +25,64 @@ class MinHeapException(Exception):
 
 
 class MinHeap:
-    def __init__(self, start_heap=None):
+    __slots__ = ("_typecode", "_arity", "_key", "_reverse", "_policy", "_heap", "_keys")
+
+    def __init__(self, start_heap=None, typecode: str = None, arity: int = 2, key=None, reverse: bool = False,
+                 policy: GrowthPolicy = None):
         """
         Initialize a new MinHeap
-        DO NOT CHANGE THIS METHOD IN ANY WAY
+
+        A typecode ('i', 'q', 'd', ...) stores the nodes in a compact typed DynamicArray, for numeric priorities.
+        arity is the number of children per node: 2 is a binary heap, 4 or 8 give a shallower heap that is faster
+        for insert-heavy workloads.
+        key is a function computed once per node when it is added; its result is cached next to the node and the
+        heap is ordered by the cached keys. reverse=True turns the heap into a max-heap.
+        policy is the growth policy of the arrays holding the heap (see growth.GrowthPolicy), e.g. one with
+        auto_shrink=False keeps remove_min() from ever resizing
         """
-        self._heap = DynamicArray()
+        if arity < 2:
+            raise MinHeapException("Arity Must Be At Least 2")
+        self._typecode = typecode
+        self._arity = arity
+        self._key = key
+        self._reverse = reverse
+        self._policy = policy
+        self._heap = DynamicArray(typecode=typecode, policy=policy)
+        # cached keys, parallel to _heap (None when nodes are compared directly)
+        self._keys = DynamicArray(policy=policy) if key is not None else None
 
         # populate MinHeap with initial values (if provided)
-        # before using this feature, implement add() method
+        # loads every node in one pass and then heapifies bottom-up in O(n)
         if start_heap:
-            for node in start_heap:
-                self.add(node)
+            self._heap.extend(start_heap)
+            self._load_keys()
+            _heapify(self._heap, arity, self._keys, reverse)
+
+    @classmethod
+    def mapped(cls, path: str, typecode: str = None, arity: int = 2, reverse: bool = False, readonly: bool = False,
+               policy: GrowthPolicy = None) -> "MinHeap":
+        """
+        Creates a MinHeap whose nodes are stored in a memory-mapped file (see DynamicArray.mapped()), so the heap
+        can be larger than memory and outlive the process. The nodes already in an existing file are heapified in
+        place; a file opened read-only must already be in heap order (as close() leaves it). Keys are not
+        supported, since they would need a second file
+
+        :param path: the file storing the nodes
+        :param typecode: the numeric typecode of the nodes, required when the file does not exist yet
+        :param arity: the number of children per node
+        :param reverse: builds a max-heap instead
+        :param readonly: maps the file read-only, for inspecting a heap without changing it
+        :param policy: the growth policy of the file backed array
+
+        :return: the MinHeap backed by the file, call close() (or flush()) to save it
+        """
+        nodes = DynamicArray.mapped(path, typecode, readonly)
+        heap = cls(typecode=nodes.get_typecode(), arity=arity, reverse=reverse, policy=policy)
+        heap._heap = nodes
+        if not readonly:
+            nodes.set_policy(policy)
+            _heapify(nodes, arity, None, reverse)
+        return heap
 
     def __str__(self) -> str:
         """
@@ -44,22 +98,11 @@ class MinHeap:
 
         :param node: an object that is being added to the MinHeap
         """
-        # adds the new node to the end of the heap
+        # adds the new node (and its key) to the end of the heap and moves it up to its place
         self._heap.append(node)
-        child_index = self._heap.length() - 1
-
-        # checks to make sure we are not at the root
-        while child_index > 0:
-            parent = (child_index - 1) // 2
-            # checks to make sure that the current node is less than it's parents
-            if self._heap.get_at_index(child_index) < self._heap.get_at_index(parent):
-                # swaps the nodes by saving the old values first and then setting their new index.
-                curr_node = self._heap.get_at_index(child_index)
-                parent_node = self._heap.get_at_index(parent)
-                self._heap.set_at_index(child_index, parent_node)
-                self._heap.set_at_index(parent, curr_node)
-            # resets the child index to the current parent
-            child_index = parent
+        if self._keys is not None:
+            self._keys.append(self._key(node))
+        _percolate_up(self._heap, self._heap.length() - 1, self._arity, self._keys, self._reverse)
 
     def is_empty(self) -> bool:
         """
@@ -95,8 +138,99 @@ class MinHeap:
         self._heap.set_at_index(0, last_element)
         # removes the last element to complete the move
         self._heap.remove_at_index(last_index)
+        if self._keys is not None:
+            self._keys.set_at_index(0, self._keys.get_at_index(last_index))
+            self._keys.remove_at_index(last_index)
         # resorts the MinHeap by percolating the new root down
-        _percolate_down(self._heap, 0, self._heap.length())
+        _percolate_down(self._heap, 0, self._heap.length(), self._arity, self._keys, self._reverse)
+        return min_val
+
+    def push_many(self, nodes) -> None:
+        """
+        Adds every node of an iterable to the MinHeap. A batch that is large compared to the heap is appended in
+        one block and the whole heap is re-heapified in O(n + k), a small batch is sifted up node by node
+
+        :param nodes: an iterable of the objects being added to the MinHeap
+        """
+        batch = nodes if isinstance(nodes, (DynamicArray, list, tuple)) else list(nodes)
+        count = batch.length() if isinstance(batch, DynamicArray) else len(batch)
+        total = self._heap.length() + count
+        # k sift-ups cost about k * log(n + k) comparisons, rebuilding costs about 2 * (n + k)
+        if count * total.bit_length() <= 2 * total:
+            for node in batch:
+                self.add(node)
+            return
+        self._heap.extend(batch)
+        if self._keys is not None:
+            self._keys.extend([self._key(node) for node in batch])
+        _heapify(self._heap, self._arity, self._keys, self._reverse)
+
+    def pop_many(self, count: int) -> DynamicArray:
+        """
+        Removes up to count of the smallest nodes and returns them in order. Each popped node is swapped to the end
+        of the heap (as heapsort does) and the popped block is cut off with a single remove_range()
+
+        :param count: the largest number of nodes being removed (fewer are returned if the heap runs out)
+
+        :return: a DynamicArray with the removed nodes, smallest first
+        """
+        if count < 0:
+            raise MinHeapException("Count Must Not Be Negative")
+        size = self._heap.length()
+        count = min(count, size)
+        result = DynamicArray(typecode=self._typecode)
+        if count == 0:
+            return result
+        data = self._heap._raw()
+        order = data if self._keys is None else self._keys._raw()
+        for end in range(size - 1, size - count - 1, -1):
+            _pop_to_end(data, order, end, self._arity, self._reverse)
+        # the popped nodes are at the end of the array, the smallest one last
+        result.extend(reversed(self._heap.view(size - count, count)))
+        self._heap.remove_range(size - count, count)
+        if self._keys is not None:
+            self._keys.remove_range(size - count, count)
+        return result
+
+    def pushpop(self, node: object) -> object:
+        """
+        Adds a node and then removes and returns the smallest node, with at most one sift. If the new node is not
+        larger than the current minimum it is returned straight away and the heap is left unchanged
+
+        :param node: an object that is being added to the MinHeap
+
+        :return: the smallest node after the new one was added
+        """
+        node_key = node if self._key is None else self._key(node)
+        if self.is_empty():
+            return node
+        root_key = self._heap.get_at_index(0) if self._keys is None else self._keys.get_at_index(0)
+        # returns the new node unless the root comes strictly before it
+        if not ((node_key < root_key) if self._reverse else (root_key < node_key)):
+            return node
+        return self._replace_root(node, node_key)
+
+    def replace(self, node: object) -> object:
+        """
+        Removes and returns the smallest node and then adds a new one, with a single sift
+
+        :param node: an object that is being added to the MinHeap
+
+        :return: the smallest node before the new one was added
+        """
+        if self.is_empty():
+            raise MinHeapException("This Heap Is Empty")
+        return self._replace_root(node, node if self._key is None else self._key(node))
+
+    def _replace_root(self, node: object, node_key: object) -> object:
+        """
+        Puts a node (with its already computed key) in place of the root, percolates it down and returns the old root
+        """
+        min_val = self._heap.get_at_index(0)
+        self._heap.set_at_index(0, node)
+        if self._keys is not None:
+            self._keys.set_at_index(0, node_key)
+        _percolate_down(self._heap, 0, self._heap.length(), self._arity, self._keys, self._reverse)
         return min_val
 
     def build_heap(self, da: DynamicArray) -> None:
@@ -106,14 +240,16 @@ class MinHeap:
         :param da: Represents the DynamicArray being added to the heap
         """
 
-        self._heap = DynamicArray()
-        # copies DynamicArray into a Heap
-        for i in range(da.length()):
-            self._heap.append(da.get_at_index(i))
-        # finds the last node that is not a leaf
-        last_non_leaf = (self._heap.length() - 2) // 2
-        for i in range(last_non_leaf, -1, -1):
-            _percolate_down(self._heap, i, self._heap.length())
+        if self._heap.get_backend() == "mapped":
+            # a file backed heap keeps its file, the values are copied into it instead
+            values = DynamicArray(da, self._typecode)
+            self._heap.remove_range(0, self._heap.length())
+            self._heap.extend(values)
+        else:
+            # copies the DynamicArray into a new Heap with a single resize
+            self._heap = DynamicArray(da, self._typecode, policy=self._policy)
+        self._load_keys()
+        _heapify(self._heap, self._arity, self._keys, self._reverse)
 
     def size(self) -> int:
         """
@@ -125,67 +261,562 @@ class MinHeap:
 
     def clear(self) -> None:
         """
-        Clears a MinHeap by creating a blank one and overwriting the old one
+        Clears a MinHeap by creating a blank one and overwriting the old one (a file backed heap is emptied
+        instead, keeping its file)
+        """
+        if self._heap.get_backend() == "mapped":
+            self._heap.remove_range(0, self._heap.length())
+        else:
+            self._heap = DynamicArray(typecode=self._typecode, policy=self._policy)
+        if self._keys is not None:
+            self._keys = DynamicArray(policy=self._policy)
+
+    def reserve(self, capacity: int) -> None:
+        """
+        Makes room for capacity nodes up front, see DynamicArray.reserve()
+        """
+        self._heap.reserve(capacity)
+        if self._keys is not None:
+            self._keys.reserve(capacity)
+
+    def shrink_to_fit(self) -> None:
+        """
+        Releases the unused capacity of the heap, see DynamicArray.shrink_to_fit()
+        """
+        self._heap.shrink_to_fit()
+        if self._keys is not None:
+            self._keys.shrink_to_fit()
+
+    def flush(self) -> None:
+        """
+        Writes the nodes of a heap created with mapped() back to its file, see DynamicArray.flush()
+        """
+        self._heap.flush()
+
+    def close(self) -> None:
+        """
+        Flushes a heap created with mapped() and closes its file. The heap cannot be used afterwards
+        """
+        self._heap.close()
+
+    def dump(self, fp) -> None:
+        """
+        Writes the heap to a binary file opened for writing: its settings, the nodes in heap order and the
+        cached keys (see DynamicArray.dump()). The key function itself is not written, pass it to load() again
+
+        :param fp: a binary file object (or anything else with a write() method taking bytes)
+        """
+        fp.write(_HEAP_HEADER.pack(_HEAP_MAGIC, 1, self._arity, self._reverse, self._keys is not None))
+        self._heap.dump(fp)
+        if self._keys is not None:
+            self._keys.dump(fp)
+
+    @classmethod
+    def load(cls, fp, key=None, policy: GrowthPolicy = None) -> "MinHeap":
+        """
+        Reads a heap written by dump(). The nodes are already in heap order, so they are restored as they are,
+        without sifting
+
+        :param fp: a binary file object positioned at the start of a dump
+        :param key: the key function the heap was created with, if it had one
+        :param policy: the growth policy of the restored heap
+
+        :return: the restored MinHeap
+        """
+        header = fp.read(_HEAP_HEADER.size)
+        if len(header) != _HEAP_HEADER.size or header[:4] != _HEAP_MAGIC:
+            raise MinHeapException("Not A MinHeap Dump")
+        _, version, arity, reverse, has_keys = _HEAP_HEADER.unpack(header)
+        if version != 1:
+            raise MinHeapException("Unsupported MinHeap Dump Version")
+        if bool(has_keys) != (key is not None):
+            raise MinHeapException("The Key Function Does Not Match The Dump")
+        nodes = DynamicArray.load(fp)
+        heap = cls(typecode=nodes.get_typecode(), arity=arity, key=key, reverse=bool(reverse), policy=policy)
+        heap._heap = nodes
+        nodes.set_policy(policy)
+        if has_keys:
+            heap._keys = DynamicArray.load(fp)
+            heap._keys.set_policy(policy)
+        return heap
+
+    def _load_keys(self) -> None:
+        """
+        Computes the cached key of every node in the heap, in one pass
         """
-        self._heap = DynamicArray()
+        if self._key is not None:
+            self._keys = DynamicArray([self._key(node) for node in self._heap], policy=self._policy)
 
 
-def heapsort(da: DynamicArray) -> None:
+class IndexedMinHeap:
     """
-    Sorts a DynamicArray in non-ascending order using the heapsort algorithm
+    MinHeap of handles ordered by a priority that can be changed after insertion. Every handle (any hashable
+    object, e.g. a graph vertex or a job id) is in the heap at most once, and a handle -> position map kept up to
+    date during every sift lets decrease_key(), update() and remove() find it in O(1) and fix the heap in O(log n)
+    """
+    __slots__ = ("_handles", "_priorities", "_position")
+
+    def __init__(self) -> None:
+        """
+        Initialize a new, empty IndexedMinHeap
+        """
+        self._handles = DynamicArray()
+        self._priorities = DynamicArray()
+        self._position = {}
+
+    def __str__(self) -> str:
+        """
+        Return IndexedMinHeap content in human-readable form
+        """
+        heap_data = [(self._handles[i], self._priorities[i]) for i in range(self._handles.length())]
+        return "INDEXED_HEAP " + str(heap_data)
+
+    def __contains__(self, handle: object) -> bool:
+        """
+        Return True if the handle is in the heap / False otherwise
+        """
+        return handle in self._position
+
+    def add(self, handle: object, priority: object) -> None:
+        """
+        Adds a handle with the given priority to the heap
+
+        :param handle: a hashable object that is not in the heap yet
+        :param priority: the value the handle is ordered by
+        """
+        if handle in self._position:
+            raise MinHeapException("This Handle Is Already In The Heap")
+        self._handles.append(handle)
+        self._priorities.append(priority)
+        index = self._handles.length() - 1
+        self._position[handle] = index
+        self._sift_up(index)
+
+    def is_empty(self) -> bool:
+        """
+        Return True if the heap is empty / False otherwise
+        """
+        return self._handles.length() == 0
+
+    def size(self) -> int:
+        """
+        Return the number of handles in the heap
+        """
+        return self._handles.length()
+
+    def get_min(self) -> object:
+        """
+        Return the handle with the smallest priority without removing it
+        """
+        if self.is_empty():
+            raise MinHeapException("This Heap Is Empty")
+        return self._handles.get_at_index(0)
+
+    def get_priority(self, handle: object) -> object:
+        """
+        Return the current priority of a handle in the heap
+        """
+        return self._priorities.get_at_index(self._index_of(handle))
+
+    def remove_min(self) -> object:
+        """
+        Removes the handle with the smallest priority and returns it
+        """
+        if self.is_empty():
+            raise MinHeapException("This Heap Is Empty")
+        handle = self._handles.get_at_index(0)
+        self._remove_at(0)
+        return handle
+
+    def decrease_key(self, handle: object, priority: object) -> None:
+        """
+        Lowers the priority of a handle in the heap
+
+        :param handle: a handle that is in the heap
+        :param priority: the new priority, which may not be larger than the current one
+        """
+        index = self._index_of(handle)
+        if self._priorities.get_at_index(index) < priority:
+            raise MinHeapException("New Priority Is Larger Than The Current One")
+        self._priorities.set_at_index(index, priority)
+        self._sift_up(index)
+
+    def update(self, handle: object, priority: object) -> None:
+        """
+        Changes the priority of a handle in the heap, in either direction
+
+        :param handle: a handle that is in the heap
+        :param priority: the new priority of the handle
+        """
+        index = self._index_of(handle)
+        self._priorities.set_at_index(index, priority)
+        # only one of the two sifts can move the handle
+        self._sift_up(index)
+        self._sift_down(self._position[handle])
+
+    def remove(self, handle: object) -> None:
+        """
+        Removes a handle from the heap, wherever it is
+
+        :param handle: a handle that is in the heap
+        """
+        self._remove_at(self._index_of(handle))
+
+    def clear(self) -> None:
+        """
+        Removes every handle from the heap
+        """
+        self._handles = DynamicArray()
+        self._priorities = DynamicArray()
+        self._position = {}
+
+    def _index_of(self, handle: object) -> int:
+        """
+        Return the position of a handle, raising MinHeapException if it is not in the heap
+        """
+        index = self._position.get(handle)
+        if index is None:
+            raise MinHeapException("This Handle Is Not In The Heap")
+        return index
+
+    def _remove_at(self, index: int) -> None:
+        """
+        Removes the entry at the given position by moving the last entry into its place and sifting that one
+        """
+        last_index = self._handles.length() - 1
+        del self._position[self._handles.get_at_index(index)]
+        if index != last_index:
+            moved = self._handles.get_at_index(last_index)
+            self._handles.set_at_index(index, moved)
+            self._priorities.set_at_index(index, self._priorities.get_at_index(last_index))
+            self._position[moved] = index
+        self._handles.remove_at_index(last_index)
+        self._priorities.remove_at_index(last_index)
+        if index != last_index:
+            self._sift_up(index)
+            self._sift_down(self._position[moved])
+
+    def _swap(self, first: int, second: int) -> None:
+        """
+        Swaps two entries and records their new positions
+        """
+        first_handle = self._handles.get_at_index(first)
+        second_handle = self._handles.get_at_index(second)
+        first_priority = self._priorities.get_at_index(first)
+        self._handles.set_at_index(first, second_handle)
+        self._handles.set_at_index(second, first_handle)
+        self._priorities.set_at_index(first, self._priorities.get_at_index(second))
+        self._priorities.set_at_index(second, first_priority)
+        self._position[first_handle] = second
+        self._position[second_handle] = first
+
+    def _sift_up(self, child_index: int) -> None:
+        """
+        Moves the entry at child_index up while it is smaller than its parent
+        """
+        while child_index > 0:
+            parent = (child_index - 1) // 2
+            if not self._priorities.get_at_index(child_index) < self._priorities.get_at_index(parent):
+                return
+            self._swap(child_index, parent)
+            child_index = parent
+
+    def _sift_down(self, parent: int) -> None:
+        """
+        Moves the entry at parent down while one of its children is smaller
+        """
+        size = self._handles.length()
+        left = 2 * parent + 1
+        while left < size:
+            smallest = parent
+            if self._priorities.get_at_index(left) < self._priorities.get_at_index(smallest):
+                smallest = left
+            right = left + 1
+            if right < size and self._priorities.get_at_index(right) < self._priorities.get_at_index(smallest):
+                smallest = right
+            if smallest == parent:
+                return
+            self._swap(parent, smallest)
+            parent = smallest
+            left = 2 * parent + 1
+
+
+# marks an exhausted source in merge(), since None can be a real value
+_EXHAUSTED = object()
+
+
+def merge(*sorted_sources, key=None):
+    """
+    Merges already sorted (non-descending) sources, e.g. the runs produced by chunk(), into one sorted stream.
+    Only the current head of every source is kept in a MinHeap, so memory is O(number of sources) and the first
+    values are produced before the sources have been fully read. Equal values come out in source order
+
+    :param sorted_sources: iterables (DynamicArrays, generators, ...) that are each sorted in non-descending order
+    :param key: optional function the sources are sorted by
+
+    :return: a generator producing every value of every source in non-descending order
+    """
+    # entries are (key, source index, value): the unique index breaks ties, so values are never compared directly
+    heap = MinHeap()
+    iterators = []
+    for source in sorted_sources:
+        iterator = iter(source)
+        value = next(iterator, _EXHAUSTED)
+        if value is not _EXHAUSTED:
+            heap.add((value if key is None else key(value), len(iterators), value))
+            iterators.append(iterator)
+
+    while not heap.is_empty():
+        _, index, value = heap.get_min()
+        yield value
+        value = next(iterators[index], _EXHAUSTED)
+        if value is _EXHAUSTED:
+            heap.remove_min()
+        else:
+            # the next value of the same source takes the place of the one just produced, with a single sift
+            heap.replace((value if key is None else key(value), index, value))
+
+
+def nsmallest(count: int, iterable, key=None) -> DynamicArray:
+    """
+    Finds the count smallest values of an iterable (which may be an unbounded stream) with a max-heap that never
+    holds more than count entries, so memory is O(count). Equal values keep their input order
+
+    :param count: the number of values being kept
+    :param iterable: the values being searched
+    :param key: optional function the values are compared by
+
+    :return: a DynamicArray with the smallest values in non-descending order
+    """
+    result = DynamicArray()
+    if count <= 0:
+        return result
+    # entries are (key, input order, value); a later entry with an equal key counts as larger, so it is dropped
+    heap = MinHeap(reverse=True)
+    for order, value in enumerate(iterable):
+        entry = (value if key is None else key(value), order, value)
+        if heap.size() < count:
+            heap.add(entry)
+        else:
+            heap.pushpop(entry)
+    # the max-heap pops the largest entries first
+    for entry in reversed(heap.pop_many(count)):
+        result.append(entry[2])
+    return result
+
+
+def nlargest(count: int, iterable, key=None) -> DynamicArray:
+    """
+    Finds the count largest values of an iterable (which may be an unbounded stream) with a min-heap that never
+    holds more than count entries, so memory is O(count). Equal values keep their input order
+
+    :param count: the number of values being kept
+    :param iterable: the values being searched
+    :param key: optional function the values are compared by
+
+    :return: a DynamicArray with the largest values in non-ascending order
+    """
+    result = DynamicArray()
+    if count <= 0:
+        return result
+    # entries are (key, -input order, value); a later entry with an equal key counts as smaller, so it is dropped
+    heap = MinHeap()
+    for order, value in enumerate(iterable):
+        entry = (value if key is None else key(value), -order, value)
+        if heap.size() < count:
+            heap.add(entry)
+        else:
+            heap.pushpop(entry)
+    for entry in reversed(heap.pop_many(count)):
+        result.append(entry[2])
+    return result
+
+
+def heapsort(da: DynamicArray, arity: int = 2, key=None, reverse: bool = False, bottom_up: bool = False) -> None:
+    """
+    Sorts a DynamicArray in non-ascending order using the heapsort algorithm. Typed DynamicArrays are sorted in
+    place in their compact storage, with numpy.sort instead of heapsort when NumPy is installed
 
     :param da: The DynamicArray being inputted to be sorted using heapsort
+    :param arity: the number of children per node of the heap used for sorting
+    :param key: optional function computed once per element, the elements are ordered by these keys
+    :param reverse: sorts in non-descending order instead (using a max-heap)
+    :param bottom_up: uses Floyd's bottom-up sift when extracting, which needs about half the comparisons
+    """
+    if arity < 2:
+        raise MinHeapException("Arity Must Be At Least 2")
+    size = da.length()
+    if key is None and vector_sort(da._data, size, descending=not reverse):
+        return
+    keys = DynamicArray([key(value) for value in da]) if key is not None else None
+    _heapify(da, arity, keys, reverse)
+    data = da._raw()
+    order = data if keys is None else keys._raw()
+    sift = _sift_bottom_up if bottom_up else _sift_down
+    # Moves the min element to the end, then sifts the element it replaced into the reduced heap
+    for end in range(size - 1, 0, -1):
+        _pop_to_end(data, order, end, arity, reverse, sift)
+
+
+def _heapify(da: DynamicArray, arity: int = 2, keys: DynamicArray = None, reverse: bool = False) -> None:
+    """
+    Rearranges a DynamicArray into a MinHeap in O(n) by percolating down every non-leaf node, bottom-up
+
+    :param da: Represents the DynamicArray being turned into a heap in place
+    :param arity: the number of children per node
+    :param keys: optional cached keys, parallel to da, that the nodes are ordered by
+    :param reverse: builds a max-heap instead
     """
     size = da.length()
-    # finds the last not leaf node and percolates down
-    for i in range((size - 2) // 2, -1, -1):
-        _percolate_down(da, i, size)
-    # Moves the min element to the end, then restores the heap properties on the reduced heap
-    for i in range(size - 1, 0, -1):
-        min_val = da.get_at_index(0)
-        da.set_at_index(0, da.get_at_index(i))
-        da.set_at_index(i, min_val)
-        _percolate_down(da, 0, i)
+    data = da._raw()
+    order = data if keys is None else keys._raw()
+    # finds the last node that is not a leaf
+    for i in range((size - 2) // arity, -1, -1):
+        _sift_down(data, order, i, data[i], order[i], size, arity, reverse)
+
+
+def _percolate_up(da: DynamicArray, child_index: int, arity: int = 2, keys: DynamicArray = None,
+                  reverse: bool = False) -> None:
+    """
+    Moves the node at child_index up while it comes before its parent
+
+    :param da: Represents a dynamicArray that is having its value percolated up
+    :param child_index: the index of the node being percolated up
+    :param arity: represents the number of children per node (2 for a binary heap)
+    :param keys: optional cached keys, parallel to da, that the nodes are compared by
+    :param reverse: compares for a max-heap instead
+    """
+    data = da._raw()
+    order = data if keys is None else keys._raw()
+    _sift_up(data, order, child_index, data[child_index], order[child_index], arity, reverse)
 
 
 # It's highly recommended that you implement the following optional          #
 # helper function for percolating elements down the MinHeap. You can call    #
 # this from inside the MinHeap class. You may edit the function definition.  #
 
-def _percolate_down(da: DynamicArray, parent: int, size: int) -> None:
+def _percolate_down(da: DynamicArray, parent: int, size: int, arity: int = 2, keys: DynamicArray = None,
+                    reverse: bool = False) -> None:
     """
     Percolates down the inputted element at the given parent index
 
     :param da: Represents a dynamicArray that is having its value percolated down
     :parent int: represent the integer that is the parent being percolated down
     :param size: represents the size of the array
+    :param arity: represents the number of children per node (2 for a binary heap)
+    :param keys: optional cached keys, parallel to da, that the nodes are compared by
+    :param reverse: compares for a max-heap instead (the largest key wins)
     """
-    left = 2 * parent + 1
-    right = 2 * parent + 2
-
-    while left < size:
-        smallest = parent
-        # compares the left and right to find the smallest value
-        if da.get_at_index(left) < da.get_at_index(smallest):
-            smallest = left
-
-        # Checks if the right is strictly the smallest value out of the left and right
-        if right < size and da.get_at_index(right) < da.get_at_index(smallest):
-            smallest = right
-
-        # Checks if the heap property has been satisfied
-        if smallest == parent:
-            parent = size
-        else:
-            # swaps the nodes by saving the old values first and then setting their new index.
-            parent_val = da.get_at_index(parent)
-            child_val = da.get_at_index(smallest)
-            da.set_at_index(parent, child_val)
-            da.set_at_index(smallest, parent_val)
-            parent = smallest
+    data = da._raw()
+    order = data if keys is None else keys._raw()
+    _sift_down(data, order, parent, data[parent], order[parent], size, arity, reverse)
 
-        left = 2 * parent + 1
-        right = 2 * parent + 2
+
+# The sift kernels below work on the raw storage of the heap (see DynamicArray._raw()) and skip the bounds checks
+# of get_at_index() / set_at_index(), so callers must only pass valid positions. Instead of swapping at every
+# level they keep a "hole" where the sifted node belongs: values are moved into the hole one level at a time and
+# the node is written once at the end, so each level costs one write instead of a two-write swap.
+# order is the array the nodes are compared by: the cached keys, or the nodes themselves (order is data).
+
+def _sift_down(data, order, hole: int, node: object, node_key: object, size: int, arity: int,
+               reverse: bool) -> None:
+    """
+    Places node (ordered by node_key) into the heap of the given size, starting at position hole and moving down
+    """
+    has_keys = order is not data
+    first_child = arity * hole + 1
+    while first_child < size:
+        # finds the child that comes first, earlier children win ties
+        best = first_child
+        best_key = order[first_child]
+        for child in range(first_child + 1, min(first_child + arity, size)):
+            child_key = order[child]
+            if (best_key < child_key) if reverse else (child_key < best_key):
+                best = child
+                best_key = child_key
+        # stops once no child comes strictly before the node being sifted
+        if not ((node_key < best_key) if reverse else (best_key < node_key)):
+            break
+        data[hole] = data[best]
+        if has_keys:
+            order[hole] = best_key
+        hole = best
+        first_child = arity * hole + 1
+    data[hole] = node
+    if has_keys:
+        order[hole] = node_key
+
+
+def _sift_up(data, order, hole: int, node: object, node_key: object, arity: int, reverse: bool) -> None:
+    """
+    Places node (ordered by node_key) into the heap starting at position hole and moving up towards the root
+    """
+    has_keys = order is not data
+    while hole > 0:
+        parent = (hole - 1) // arity
+        parent_key = order[parent]
+        # stops as soon as the node does not come before it's parent
+        if not ((parent_key < node_key) if reverse else (node_key < parent_key)):
+            break
+        data[hole] = data[parent]
+        if has_keys:
+            order[hole] = parent_key
+        hole = parent
+    data[hole] = node
+    if has_keys:
+        order[hole] = node_key
+
+
+def _sift_bottom_up(data, order, hole: int, node: object, node_key: object, size: int, arity: int,
+                    reverse: bool) -> None:
+    """
+    Floyd's variant of _sift_down(). The hole is first walked all the way down to a leaf along the path of the
+    children that come first, without comparing them to the node, and the node is then sifted up from that leaf.
+    A node taken from the bottom of the heap (as in heapsort) nearly always belongs near the bottom again, so this
+    saves about one comparison per level
+    """
+    has_keys = order is not data
+    start = hole
+    first_child = arity * hole + 1
+    while first_child < size:
+        best = first_child
+        best_key = order[first_child]
+        for child in range(first_child + 1, min(first_child + arity, size)):
+            child_key = order[child]
+            if (best_key < child_key) if reverse else (child_key < best_key):
+                best = child
+                best_key = child_key
+        data[hole] = data[best]
+        if has_keys:
+            order[hole] = best_key
+        hole = best
+        first_child = arity * hole + 1
+    # the values on the path have all moved up a level, so the node goes back up until its parent comes first
+    while hole > start:
+        parent = (hole - 1) // arity
+        parent_key = order[parent]
+        if not ((parent_key < node_key) if reverse else (node_key < parent_key)):
+            break
+        data[hole] = data[parent]
+        if has_keys:
+            order[hole] = parent_key
+        hole = parent
+    data[hole] = node
+    if has_keys:
+        order[hole] = node_key
+
+
+def _pop_to_end(data, order, end: int, arity: int, reverse: bool, sift=_sift_down) -> None:
+    """
+    Moves the root of the heap data[0:end + 1] to position end and sifts the node that was there into the
+    remaining heap data[0:end]
+    """
+    node = data[end]
+    node_key = order[end]
+    data[end] = data[0]
+    if order is not data:
+        order[end] = order[0]
+    sift(data, order, 0, node, node_key, end, arity, reverse)
 
 
 # ------------------- BASIC TESTING -----------------------------------------
@@ -280,3 +911,82 @@ if __name__ == '__main__':
     print(f"Before: {da}")
     heapsort(da)
     print(f"After:  {da}")
+
+    print("\nIndexedMinHeap example 1")
+    print("------------------------")
+    h = IndexedMinHeap()
+    for vertex, distance in [('A', 7), ('B', 3), ('C', 9), ('D', 5)]:
+        h.add(vertex, distance)
+    print(h)
+    h.decrease_key('C', 1)
+    h.update('B', 8)
+    h.remove('D')
+    print(h, 'D' in h, h.size())
+    while not h.is_empty():
+        print(h.remove_min(), end=' ')
+    print()
+
+    print("\nmerge / nsmallest / nlargest example 1")
+    print("--------------------------------------")
+    da = DynamicArray([10, 20, 30, 30, 5, 10, 1, 2, 3, 4])
+    print(list(merge(*chunk(da))))
+    print(nsmallest(3, da), nlargest(3, da))
+
+    print("\ndump / load example 1")
+    print("---------------------")
+    import io
+    h = MinHeap([50, 7, 30, 2, 9], typecode='q', arity=4)
+    checkpoint = io.BytesIO()
+    h.dump(checkpoint)
+    checkpoint.seek(0)
+    restored = MinHeap.load(checkpoint)
+    print(h)
+    print(restored)
+    print(restored.remove_min(), restored.remove_min())
+
+    print("\npickle / copy of an empty heap example 1")
+    print("----------------------------------------")
+    import copy
+    import pickle
+    for h in [MinHeap(), MinHeap(typecode='q', key=abs)]:
+        restored = pickle.loads(pickle.dumps(h)) if h._key is None else copy.deepcopy(h)
+        restored.add(-3)
+        print(h, restored)
+
+    print("\nhole-based sifting / bottom-up heapsort counters")
+    print("-----------------------------------------------")
+
+    # instrumentation works with the min_heap module's MinHeap, which is a different class from the copy of it
+    # running as __main__
+    import random
+    import min_heap
+    from instrumentation import instrumented
+
+    random.seed(261)
+    values = random.sample(range(2000), 2000)
+    results = {}
+    for bottom_up in (False, True):
+        da = DynamicArray(values)
+        with instrumented(da) as stats:
+            heapsort(da, bottom_up=bottom_up)
+        results[bottom_up] = stats.as_dict()
+        print(f"bottom_up={bottom_up}: {stats.comparisons} comparisons, {stats.moves} writes")
+    assert results[True]["comparisons"] < results[False]["comparisons"]
+
+    # a swap-based sift writes two values per level moved, a hole-based sift one value per level plus one
+    h = min_heap.MinHeap(values)
+    levels = 0
+    with instrumented(h) as stats:
+        for value in range(-1, -101, -1):
+            index = h.size()
+            h.add(value)
+            # every new minimum travels from the leaf it was appended at all the way to the root
+            assert h.get_min() == value
+            while index > 0:
+                index = (index - 1) // 2
+                levels += 1
+    # each add also writes the appended node once, a swap then writes two values per level moved
+    swap_writes = 100 + 2 * levels
+    print(f"100 adds moved {levels} levels with {stats.moves} writes (swaps would need {swap_writes})")
+    # the hole-based sift writes one value per level, plus the sifted node itself once
+    assert stats.moves == 100 + levels + 100 < swap_writes
@@ -0,0 +1,297 @@
+# Course: CS261 - Data Structures
+# Description: Timer scheduler on a MinHeap keyed by deadline, with O(1) lazy cancellation
+
+import time
+
+from min_heap import DynamicArray, MinHeap, MinHeapException
+
+
+class Timer:
+    """
+    A scheduled callback, as returned by Scheduler.call_at() / call_later()
+    """
+    __slots__ = ("deadline", "sequence", "callback", "args", "cancelled", "_scheduler", "_queued")
+
+    def __init__(self, deadline: float, sequence: int, callback, args: tuple, scheduler: "Scheduler") -> None:
+        self.deadline = deadline
+        self.sequence = sequence
+        self.callback = callback
+        self.args = args
+        self.cancelled = False
+        self._scheduler = scheduler
+        # True while the timer is in the heap (False once run_due() took it off for its batch)
+        self._queued = True
+
+    def __repr__(self) -> str:
+        state = " cancelled" if self.cancelled else ""
+        return f"<Timer #{self.sequence} at {self.deadline}{state}>"
+
+    def cancel(self) -> bool:
+        """
+        Cancels the timer, see Scheduler.cancel()
+        """
+        return self._scheduler is not None and self._scheduler.cancel(self)
+
+
+def _order(timer: Timer) -> tuple:
+    """
+    Heap key of a timer: its deadline, and for equal deadlines the order the timers were scheduled in (FIFO)
+    """
+    return timer.deadline, timer.sequence
+
+
+class Scheduler:
+    """
+    Timer queue on a 4-ary MinHeap ordered by deadline (the cached tuple keys are compared in C, and the shallower
+    heap needs fewer sifts per removal). Cancelling a timer only marks it (a tombstone) in O(1), the
+    entry stays in the heap and is dropped when it reaches the top. Once the tombstones are more than
+    compact_ratio of the heap (and at least compact_min), the heap is rebuilt from the live timers with
+    build_heap() in O(n), so cancelled timers cannot pile up
+    """
+
+    def __init__(self, clock=time.monotonic, compact_ratio: float = 0.5, compact_min: int = 64) -> None:
+        """
+        Initialize a new Scheduler
+
+        :param clock: a function returning the current time, e.g. time.monotonic or a FakeClock
+        :param compact_ratio: the share of cancelled entries in the heap that triggers a rebuild
+        :param compact_min: heaps with fewer cancelled entries than this are never rebuilt
+        """
+        self._clock = clock
+        self._compact_ratio = compact_ratio
+        self._compact_min = compact_min
+        self._heap = MinHeap(arity=4, key=_order)
+        self._sequence = 0
+        self._cancelled = 0
+
+    def __str__(self) -> str:
+        """
+        Return Scheduler content in human-readable form
+        """
+        return f"SCHEDULER Live/Cancelled: {self.size()}/{self._cancelled}"
+
+    def size(self) -> int:
+        """
+        Return the number of timers that are scheduled and not cancelled
+        """
+        return self._heap.size() - self._cancelled
+
+    def is_empty(self) -> bool:
+        """
+        Return True if no timers are waiting / False otherwise
+        """
+        return self.size() == 0
+
+    def call_at(self, deadline: float, callback, *args) -> Timer:
+        """
+        Schedules callback(*args) to run once the clock reaches deadline
+
+        :return: the Timer, which can be cancelled
+        """
+        timer = Timer(deadline, self._sequence, callback, args, self)
+        self._sequence += 1
+        self._heap.add(timer)
+        return timer
+
+    def call_later(self, delay: float, callback, *args) -> Timer:
+        """
+        Schedules callback(*args) to run delay seconds from now (by the scheduler's clock)
+
+        :return: the Timer, which can be cancelled
+        """
+        return self.call_at(self._clock() + delay, callback, *args)
+
+    def cancel(self, timer: Timer) -> bool:
+        """
+        Cancels a timer in O(1) by marking it. May compact the heap, see the class description
+
+        :return: True if the timer was waiting, False if it already ran or was already cancelled
+        """
+        if timer.cancelled or timer._scheduler is not self:
+            return False
+        timer.cancelled = True
+        if not timer._queued:
+            return True
+        self._cancelled += 1
+        if self._cancelled >= self._compact_min and self._cancelled > self._heap.size() * self._compact_ratio:
+            self.compact()
+        return True
+
+    def compact(self) -> None:
+        """
+        Rebuilds the heap from the timers that are still live, dropping every tombstone
+        """
+        live = DynamicArray()
+        live.reserve(self.size())
+        for timer in self._heap._heap:
+            if not timer.cancelled:
+                live.append(timer)
+        self._heap.build_heap(live)
+        self._cancelled = 0
+
+    def _drop_cancelled(self) -> None:
+        """
+        Removes the tombstones at the top of the heap, so its minimum is a live timer (or the heap is empty)
+        """
+        while not self._heap.is_empty() and self._heap.get_min().cancelled:
+            self._heap.remove_min()
+            self._cancelled -= 1
+
+    def next_deadline(self) -> float:
+        """
+        Return the deadline of the next live timer, or None when no timers are waiting
+        """
+        self._drop_cancelled()
+        if self._heap.is_empty():
+            return None
+        return self._heap.get_min().deadline
+
+    def run_due(self, now: float = None, limit: int = None) -> int:
+        """
+        Runs every timer whose deadline is not after now, in deadline order (FIFO for equal deadlines). The due
+        timers are taken off the heap as one batch before any callback runs, so timers scheduled by the callbacks
+        wait for the next call even if they are already due. A callback may cancel timers later in the batch.
+        If a callback raises, the timers after it in the batch go back into the heap (still due, in the same order)
+        before the exception is passed on, so they run on the next call
+
+        :param now: the current time (defaults to the scheduler's clock)
+        :param limit: the largest number of timers run, the rest stay due
+
+        :return: the number of callbacks that ran
+        """
+        if now is None:
+            now = self._clock()
+        batch = DynamicArray()
+        heap = self._heap
+        while not heap.is_empty() and (limit is None or batch.length() < limit):
+            timer = heap.get_min()
+            if timer.cancelled:
+                heap.remove_min()
+                self._cancelled -= 1
+                continue
+            if timer.deadline > now:
+                break
+            batch.append(heap.remove_min())
+            timer._queued = False
+
+        ran = 0
+        index = 0
+        try:
+            while index < batch.length():
+                timer = batch[index]
+                index += 1
+                if timer.cancelled:
+                    continue
+                # a timer that has run can no longer be cancelled
+                timer._scheduler = None
+                timer.callback(*timer.args)
+                ran += 1
+        finally:
+            # only reached with timers left when a callback raised
+            for i in range(index, batch.length()):
+                timer = batch[i]
+                if not timer.cancelled:
+                    timer._queued = True
+                    heap.add(timer)
+        return ran
+
+
+class FakeClock:
+    """
+    Manually advanced clock for testing code that uses a Scheduler, without sleeping
+    """
+
+    def __init__(self, start: float = 0.0) -> None:
+        self.now = start
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float, scheduler: Scheduler = None) -> int:
+        """
+        Moves the clock forward. With a scheduler, the clock stops at every deadline on the way and runs the timers
+        due there, so timers scheduled by callbacks also run at the right (simulated) time
+
+        :return: the number of callbacks that ran
+        """
+        if seconds < 0:
+            raise MinHeapException("A Clock Cannot Go Backwards")
+        end = self.now + seconds
+        ran = 0
+        if scheduler is not None:
+            deadline = scheduler.next_deadline()
+            while deadline is not None and deadline <= end:
+                self.now = max(self.now, deadline)
+                ran += scheduler.run_due(self.now)
+                deadline = scheduler.next_deadline()
+        self.now = end
+        return ran
+
+
+# ------------------- BASIC TESTING -----------------------------------------
+
+
+if __name__ == "__main__":
+    import random
+
+    print("\n# Scheduler example 1")
+    clock = FakeClock()
+    scheduler = Scheduler(clock)
+    fired = []
+    for name, delay in [("c", 3), ("a", 1), ("b", 1), ("d", 5), ("e", 3)]:
+        scheduler.call_later(delay, fired.append, name)
+    timer = scheduler.call_later(2, fired.append, "cancelled")
+    print(scheduler, timer.cancel(), timer.cancel())
+    # cancelled by a timer with the same deadline that was scheduled before it, so it runs first in the same batch
+    scheduler.call_later(1, lambda: later.cancel())
+    later = scheduler.call_later(1, fired.append, "cancelled in batch")
+    # a callback scheduling another timer, which runs at its own simulated time
+    scheduler.call_later(2, lambda: scheduler.call_later(0.5, fired.append, "chained"))
+    print(clock.advance(4, scheduler), fired, clock())
+    print(clock.advance(10, scheduler), fired, scheduler)
+
+    print("\n# a callback that raises")
+
+    def boom():
+        raise ValueError("boom")
+
+    scheduler = Scheduler(FakeClock())
+    fired = []
+    scheduler.call_at(1, fired.append, "a")
+    scheduler.call_at(1, boom)
+    timer = scheduler.call_at(1, fired.append, "c")
+    try:
+        scheduler.run_due(1)
+    except ValueError as error:
+        print("run_due raised", repr(error), fired, scheduler)
+    assert fired == ["a"] and scheduler.size() == 1
+    print(scheduler.run_due(1), fired, timer.cancel(), scheduler)
+    assert fired == ["a", "c"]
+
+    print("\n# lazy cancellation and compaction")
+    scheduler = Scheduler(FakeClock())
+    timers = [scheduler.call_later(random.random(), None) for _ in range(1000)]
+    for timer in timers[:600]:
+        timer.cancel()
+    print(scheduler, "heap entries:", scheduler._heap.size())
+
+    print("\n# FIFO order and throughput")
+    random.seed(261)
+    clock = FakeClock()
+    scheduler = Scheduler(clock)
+    order = []
+    count = 200_000
+    start = time.perf_counter()
+    timers = [scheduler.call_later(random.randint(1, 100), order.append, i) for i in range(count)]
+    scheduled = time.perf_counter()
+    cancelled_timers = random.sample(timers, count // 2)
+    for timer in cancelled_timers:
+        timer.cancel()
+    cancelled = time.perf_counter()
+    ran = scheduler.run_due(100)
+    finished = time.perf_counter()
+    dropped = set(timer.sequence for timer in cancelled_timers)
+    expected = sorted((timer.deadline, timer.sequence) for timer in timers if timer.sequence not in dropped)
+    assert ran == count // 2 and [sequence for _, sequence in expected] == order
+    print(f"scheduled {count} timers in {scheduled - start:.2f}s, cancelled {count // 2} in "
+          f"{cancelled - scheduled:.2f}s, ran {ran} in {finished - cancelled:.2f}s (FIFO order checked)")
@@ -0,0 +1,303 @@
+# Course: CS261 - Data Structures
+# Description: Fixed size storage arrays for DynamicArray and the registry used to choose between them
+
+from typed_array import TypedArray
+
+try:
+    from static_array import StaticArray
+except ImportError:
+    StaticArray = None
+
+
+class StorageException(IndexError):
+    """
+    Custom exception raised by ListArray for invalid indices and by the registry for unknown backends
+    """
+    pass
+
+
+class ListArray:
+    """
+    Fixed size array with the same interface as StaticArray, storing its values in a preallocated Python list.
+    get() / set() check the index just like StaticArray does, but the [] operators are the same functions rather
+    than a second call on top of them, and raw() gives internal loops the list itself
+    """
+    __slots__ = ("_data",)
+
+    def __init__(self, size: int = 10) -> None:
+        """
+        Creates an array that can hold size values, all None to begin with
+        """
+        if size < 1:
+            raise StorageException("Array size must be a positive integer")
+        self._data = [None] * size
+
+    def __iter__(self):
+        """
+        Iterates over every value in the array
+        """
+        return iter(self._data)
+
+    def __str__(self) -> str:
+        """
+        Return content of the array in human-readable form (in the same format as StaticArray)
+        """
+        return f"STAT_ARR Size: {len(self._data)} {self._data}"
+
+    def get(self, index: int) -> object:
+        """
+        Returns the value stored at the given index, invalid indices raise StorageException
+        """
+        if index < 0 or index >= len(self._data):
+            raise StorageException("Index out of bounds")
+        return self._data[index]
+
+    def set(self, index: int, value: object) -> None:
+        """
+        Stores a value at the given index, invalid indices raise StorageException
+        """
+        if index < 0 or index >= len(self._data):
+            raise StorageException("Index out of bounds")
+        self._data[index] = value
+
+    __getitem__ = get
+    __setitem__ = set
+
+    def length(self) -> int:
+        """
+        Return the number of values the array can hold
+        """
+        return len(self._data)
+
+    def block(self, start: int, stop: int) -> list:
+        """
+        Return a copy of the values from start up to (not including) stop as a list
+        """
+        return self._data[start:stop]
+
+    def raw(self) -> list:
+        """
+        Return the underlying list itself, for internal loops that already did their own bounds checking
+        """
+        return self._data
+
+    def copy_from(self, dest_start: int, source, source_start: int, count: int) -> None:
+        """
+        Copies a block of values from another ListArray (or this one), a list or a tuple in a single slice move.
+        Overlapping blocks are handled correctly.
+
+        :param dest_start: the index in this array the first value is copied to
+        :param source: the ListArray, list or tuple being copied from
+        :param source_start: the index of the first value being copied
+        :param count: the number of values being copied
+        """
+        values = source._data if isinstance(source, ListArray) else source
+        if (dest_start < 0 or source_start < 0 or count < 0 or dest_start + count > len(self._data)
+                or source_start + count > len(values)):
+            raise StorageException("Index out of bounds")
+        self._data[dest_start:dest_start + count] = values[source_start:source_start + count]
+
+
+# arrays of at most this many values are stored in a SmallArray by the "list" backend
+SMALL_CAPACITY = 4
+_SMALL_FIELDS = ("_v0", "_v1", "_v2", "_v3")
+
+
+class SmallArray:
+    """
+    Fixed size array of at most SMALL_CAPACITY values, kept in the object's own slots. A ListArray needs a second
+    object (its list) on top of itself, which makes up most of the memory of the tiny arrays chunk(), filter() and
+    find_mode() create by the million. Same interface as ListArray apart from raw(), so internal loops index the
+    SmallArray itself, which is all a handful of values needs
+    """
+    __slots__ = ("_length",) + _SMALL_FIELDS
+
+    def __init__(self, size: int = SMALL_CAPACITY) -> None:
+        """
+        Creates an array that can hold size values (1 to SMALL_CAPACITY), all None to begin with
+        """
+        if size < 1 or size > SMALL_CAPACITY:
+            raise StorageException(f"A SmallArray holds 1 to {SMALL_CAPACITY} values")
+        self._length = size
+        self._v0 = self._v1 = self._v2 = self._v3 = None
+
+    def __iter__(self):
+        """
+        Iterates over every value in the array
+        """
+        return iter(self.block(0, self._length))
+
+    def __str__(self) -> str:
+        """
+        Return content of the array in human-readable form (in the same format as StaticArray)
+        """
+        return f"STAT_ARR Size: {self._length} {self.block(0, self._length)}"
+
+    def get(self, index: int) -> object:
+        """
+        Returns the value stored at the given index, invalid indices raise StorageException
+        """
+        if index < 0 or index >= self._length:
+            raise StorageException("Index out of bounds")
+        return getattr(self, _SMALL_FIELDS[index])
+
+    def set(self, index: int, value: object) -> None:
+        """
+        Stores a value at the given index, invalid indices raise StorageException
+        """
+        if index < 0 or index >= self._length:
+            raise StorageException("Index out of bounds")
+        setattr(self, _SMALL_FIELDS[index], value)
+
+    __getitem__ = get
+    __setitem__ = set
+
+    def length(self) -> int:
+        """
+        Return the number of values the array can hold
+        """
+        return self._length
+
+    def block(self, start: int, stop: int) -> list:
+        """
+        Return a copy of the values from start up to (not including) stop as a list
+        """
+        return [self._v0, self._v1, self._v2, self._v3][start:min(stop, self._length)]
+
+    def copy_from(self, dest_start: int, source, source_start: int, count: int) -> None:
+        """
+        Copies a block of values from a SmallArray (or this one), a ListArray, a list or a tuple. Overlapping blocks
+        are handled correctly, since the values are read out before any is written
+
+        :param dest_start: the index in this array the first value is copied to
+        :param source: the array, list or tuple being copied from
+        :param source_start: the index of the first value being copied
+        :param count: the number of values being copied
+        """
+        if isinstance(source, (list, tuple)):
+            values = source[source_start:source_start + count]
+        else:
+            values = source.block(source_start, source_start + count)
+        # a block cut short by the end of the source has fewer than count values
+        if dest_start < 0 or source_start < 0 or len(values) != count or dest_start + count > self._length:
+            raise StorageException("Index out of bounds")
+        for field, value in zip(_SMALL_FIELDS[dest_start:dest_start + count], values):
+            setattr(self, field, value)
+
+
+class EmptyStorage:
+    """
+    Stand-in storage shared by every DynamicArray that has not stored a value yet, so the many empty arrays made
+    by chunk(), filter(), find_mode() ... do not each allocate their own. Reads are answered by a shared template
+    array of the same backend and capacity, writes are refused: a DynamicArray swaps in real storage before its
+    first write. Pickling or copying an EmptyStorage gives back the shared instance for its backend, capacity and
+    typecode
+    """
+    __slots__ = ("_template", "_key")
+
+    def __init__(self, template, key: tuple) -> None:
+        self._template = template
+        self._key = key
+
+    def __getattr__(self, name: str):
+        # private names are never delegated, so a half-built instance (e.g. while unpickling) cannot recurse
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self._template, name)
+
+    def __reduce__(self):
+        return empty_storage, self._key
+
+    def __str__(self) -> str:
+        return str(self._template)
+
+    def __iter__(self):
+        return iter(self._template)
+
+    def __getitem__(self, index: int) -> object:
+        return self._template[index]
+
+    def set(self, index: int, value: object) -> None:
+        raise StorageException("Shared empty storage cannot be written to")
+
+    __setitem__ = set
+
+
+def _untyped(factory):
+    """
+    Turns a storage class for regular Python objects into a backend factory that rejects typecodes
+    """
+    def make(capacity: int, typecode: str):
+        if typecode is not None:
+            raise StorageException(f"{factory.__name__} cannot store typed values")
+        return factory(capacity)
+    return make
+
+
+def _list(capacity: int, typecode: str):
+    """
+    Factory of the "list" backend: a SmallArray for up to SMALL_CAPACITY values, a ListArray for more
+    """
+    if typecode is not None:
+        raise StorageException("ListArray cannot store typed values")
+    return SmallArray(capacity) if capacity <= SMALL_CAPACITY else ListArray(capacity)
+
+
+def _typed(capacity: int, typecode: str) -> TypedArray:
+    if typecode is None:
+        raise StorageException("The typed backend needs a typecode")
+    return TypedArray(capacity, typecode)
+
+
+# backend name -> factory(capacity, typecode) returning a new storage array
+BACKENDS = {"list": _list, "typed": _typed}
+if StaticArray is not None:
+    BACKENDS["static"] = _untyped(StaticArray)
+
+
+def register_backend(name: str, factory) -> None:
+    """
+    Makes a storage backend available to DynamicArray(backend=name)
+
+    :param name: the name the backend is selected by
+    :param factory: a function called as factory(capacity, typecode) that returns a new fixed size storage array
+                    with the StaticArray interface (get, set, [], length)
+    """
+    BACKENDS[name] = factory
+    # empty arrays of a replaced backend must not keep sharing the old backend's template
+    for key in [key for key in _EMPTY if key[0] == name]:
+        del _EMPTY[key]
+
+
+def default_backend(typecode: str) -> str:
+    """
+    Return the backend used when none is chosen: "typed" for typed arrays, "list" otherwise
+    """
+    return "list" if typecode is None else "typed"
+
+
+def make_storage(backend: str, capacity: int, typecode: str = None):
+    """
+    Creates a new storage array of the given backend. Unknown backends raise StorageException
+    """
+    try:
+        factory = BACKENDS[backend]
+    except KeyError:
+        raise StorageException(f"Unknown storage backend {backend!r}") from None
+    return factory(capacity, typecode)
+
+
+# (backend, capacity, typecode) -> the EmptyStorage shared by the empty arrays of that kind
+_EMPTY = {}
+
+
+def empty_storage(backend: str, capacity: int, typecode: str = None) -> EmptyStorage:
+    """
+    Return the shared EmptyStorage for arrays of the given backend, capacity and typecode. Unknown backends raise
+    StorageException, just like make_storage()
+    """
+    key = (backend, capacity, typecode)
+    empty = _EMPTY.get(key)
+    if empty is None:
+        empty = _EMPTY[key] = EmptyStorage(make_storage(backend, capacity, typecode), key)
+    return empty
@@ -0,0 +1,155 @@
+# Course: CS261 - Data Structures
+# Description: Fixed size array that stores numbers in a compact typed buffer
+
+from array import array
+
+
+class TypedArrayException(TypeError):
+    """
+    Custom exception raised by TypedArray for invalid indices and for values that do not fit its typecode
+    """
+    pass
+
+
+class TypedArray:
+    """
+    Fixed size array with the same interface as StaticArray, but storing its values unboxed in a contiguous
+    array.array buffer. The typecode ('i', 'q', 'd', ...) decides which values can be stored.
+    """
+    __slots__ = ("_typecode", "_data")
+
+    def __init__(self, size: int = 10, typecode: str = 'q') -> None:
+        """
+        Creates a zero filled array that can hold size values of the given typecode
+        """
+        if size < 1:
+            raise TypedArrayException("Array size must be a positive integer")
+        self._typecode = typecode
+        self._data = array(typecode, bytes(size * array(typecode).itemsize))
+
+    @classmethod
+    def wrap(cls, values: array) -> "TypedArray":
+        """
+        Creates a TypedArray that takes ownership of an existing, non-empty array.array without copying it
+        """
+        if len(values) < 1:
+            raise TypedArrayException("Array size must be a positive integer")
+        result = cls.__new__(cls)
+        result._typecode = values.typecode
+        result._data = values
+        return result
+
+    def __iter__(self):
+        """
+        Iterates over every value in the array
+        """
+        return iter(self._data)
+
+    def __str__(self) -> str:
+        """
+        Return content of the array in human-readable form
+        """
+        return f"TYPED_ARR Size: {len(self._data)} '{self._typecode}' {self._data.tolist()}"
+
+    def get(self, index: int) -> object:
+        """
+        Returns the value stored at the given index, invalid indices raise TypedArrayException
+        """
+        if index < 0 or index >= len(self._data):
+            raise TypedArrayException("Index out of bounds")
+        return self._data[index]
+
+    def set(self, index: int, value: object) -> None:
+        """
+        Stores a value at the given index. Invalid indices and values that do not fit the typecode
+        raise TypedArrayException
+        """
+        if index < 0 or index >= len(self._data):
+            raise TypedArrayException("Index out of bounds")
+        try:
+            self._data[index] = value
+        except (TypeError, OverflowError) as error:
+            raise TypedArrayException(f"{value!r} cannot be stored in a '{self._typecode}' array") from error
+
+    def __getitem__(self, index: int) -> object:
+        """
+        Same functionality as get() method above, but called using array[index] syntax
+        """
+        return self.get(index)
+
+    def __setitem__(self, index: int, value: object) -> None:
+        """
+        Same functionality as set() method above, but called using array[index] syntax
+        """
+        self.set(index, value)
+
+    def length(self) -> int:
+        """
+        Return the number of values the array can hold
+        """
+        return len(self._data)
+
+    @property
+    def typecode(self) -> str:
+        """
+        Return the array.array typecode of the stored values
+        """
+        return self._typecode
+
+    def validate(self, value: object) -> None:
+        """
+        Raises TypedArrayException if the value cannot be stored in this array
+        """
+        self.pack((value,))
+
+    def pack(self, values) -> "TypedArray":
+        """
+        Converts a sequence of values into a new TypedArray of the same typecode, validating all of them at once
+
+        :param values: a sequence of the values being converted
+
+        :return: a TypedArray holding exactly the given values
+        """
+        try:
+            packed = array(self._typecode, values)
+        except (TypeError, OverflowError) as error:
+            raise TypedArrayException(f"values cannot be stored in a '{self._typecode}' array") from error
+        result = TypedArray.__new__(TypedArray)
+        result._typecode = self._typecode
+        result._data = packed
+        return result
+
+    def block(self, start: int, stop: int) -> array:
+        """
+        Return a copy of the values from start up to (not including) stop as an array.array
+        """
+        return self._data[start:stop]
+
+    def raw(self) -> array:
+        """
+        Return the underlying array.array itself, for internal loops that already did their own bounds checking
+        and only move values that were validated when they were first stored
+        """
+        return self._data
+
+    def buffer(self) -> memoryview:
+        """
+        Return a writable memoryview over the raw buffer, e.g. for numpy.frombuffer()
+        """
+        return memoryview(self._data)
+
+    def copy_from(self, dest_start: int, source: "TypedArray", source_start: int, count: int) -> None:
+        """
+        Copies a block of values from another TypedArray with the same typecode (or from this one) in a single
+        slice move. Overlapping blocks are handled correctly.
+
+        :param dest_start: the index in this array the first value is copied to
+        :param source: the TypedArray being copied from
+        :param source_start: the index of the first value being copied
+        :param count: the number of values being copied
+        """
+        if (dest_start < 0 or source_start < 0 or count < 0 or dest_start + count > len(self._data)
+                or source_start + count > len(source._data)):
+            raise TypedArrayException("Index out of bounds")
+        # block() always returns a copy, so it works for any source storage and for overlapping blocks
+        self._data[dest_start:dest_start + count] = source.block(source_start, source_start + count)
@@ -0,0 +1,287 @@
+# Course: CS261 - Data Structures
+# Description: Optional NumPy fast paths for typed DynamicArray map / filter / reduce and heapsort
+
+import operator
+from array import array
+
+from typed_array import TypedArray
+
+# NumPy is imported the first time a typed array could use it (see _load_numpy()), so importing the data
+# structures stays fast and arrays of regular objects never pay for it
+numpy = None
+_numpy_loaded = False
+
+# typecodes numpy can view directly ('u' and 'w' hold characters, not numbers)
+_NUMERIC_TYPECODES = frozenset("bBhHiIlLqQfd")
+
+# returned by vector_reduce() when the reduction cannot be vectorized
+NOT_VECTORIZED = object()
+
+
+def _load_numpy() -> bool:
+    """
+    Imports NumPy on first use
+
+    :return: True if NumPy is installed
+    """
+    global numpy, _numpy_loaded
+    if not _numpy_loaded:
+        _numpy_loaded = True
+        try:
+            import numpy
+        except ImportError:
+            numpy = None
+    return numpy is not None
+
+
+def available() -> bool:
+    """
+    Return True if NumPy is installed and the fast paths can be used
+    """
+    return _load_numpy()
+
+
+def as_ndarray(store, size: int):
+    """
+    Returns a NumPy array sharing the first size values of a typed storage array, or None when the fast paths
+    do not apply (NumPy is missing, or the storage holds regular Python objects)
+
+    :param store: the underlying storage array of a DynamicArray
+    :param size: the number of values in use
+    """
+    if not isinstance(store, TypedArray) or store.typecode not in _NUMERIC_TYPECODES or not _load_numpy():
+        return None
+    return numpy.frombuffer(store.buffer(), dtype=store.typecode)[:size]
+
+
+def _to_storage(result):
+    """
+    Converts a NumPy result into a (storage, size) pair a DynamicArray can adopt. Results with a dtype array.array
+    cannot hold (e.g. booleans) come back as a Python list instead of a TypedArray
+    """
+    if result.dtype.char in _NUMERIC_TYPECODES:
+        values = array(result.dtype.char, result.tobytes())
+        if len(values) == 0:
+            # a TypedArray needs at least one slot, so an empty result (a filter that kept nothing) gets one unused
+            values.append(0)
+        return TypedArray.wrap(values), len(result)
+    return result.tolist(), len(result)
+
+
+def _widened(values):
+    """
+    Returns the values as int64 or float64, the closest NumPy types to Python's int and float, so element-wise
+    arithmetic does not wrap around in small types like 'B' or 'i'. uint64 values are left as they are
+    """
+    if values.dtype.kind == "f":
+        return values.astype(numpy.float64)
+    if values.dtype.kind in "iu" and values.dtype != numpy.uint64:
+        return values.astype(numpy.int64)
+    return values
+
+
+def _call_whole(func, values):
+    """
+    Calls an element-wise function once on a whole NumPy array. Returns None if the function does not work on
+    arrays or does not produce one result per element
+    """
+    try:
+        result = func(values)
+    except Exception:
+        return None
+    if not isinstance(result, numpy.ndarray) or result.shape != values.shape:
+        return None
+    return result
+
+
+def _wrapped(func, values, result) -> bool:
+    """
+    Checks an integer result for wrap-around: NumPy integers silently wrap at 64 bits where Python's int keeps
+    growing. The function is computed again in float64, which only rounds, and every value has to agree with the
+    integer result up to that rounding. Results that are not integers cannot wrap
+
+    :return: True if the result may have wrapped (or could not be checked), so the Python loop has to be used
+    """
+    if result.dtype.kind not in "iu":
+        return False
+    with numpy.errstate(all="ignore"):
+        estimate = _call_whole(func, values.astype(numpy.float64))
+        if estimate is None:
+            return True
+        difference = numpy.abs(result.astype(numpy.float64) - estimate)
+        return not bool(numpy.all(difference <= 1e-9 * numpy.abs(estimate) + 1))
+
+
+def vector_map(store, size: int, map_func, vectorize: bool = False):
+    """
+    Applies map_func to every value with a single NumPy call. NumPy ufuncs (numpy.sqrt, numpy.negative, ...) are
+    always vectorized, other functions only when vectorize is True, in which case they are called once with the
+    whole array and must work element-wise.
+
+    Integer results that may have wrapped around the 64-bit range (see _wrapped()) fall back to the Python loop,
+    so the values are the same as the loop's, e.g. 2 ** 62 * 2 stays 2 ** 63
+
+    :return: a (storage, size) pair holding the results, or None to fall back to the Python loop
+    """
+    values = as_ndarray(store, size)
+    if values is None or size == 0:
+        return None
+    values = _widened(values)
+    if isinstance(map_func, numpy.ufunc) and map_func.nin == 1 and map_func.nout == 1:
+        result = map_func(values)
+    elif vectorize:
+        result = _call_whole(map_func, values)
+    else:
+        return None
+    if result is None or _wrapped(map_func, values, result):
+        return None
+    return _to_storage(result)
+
+
+def vector_filter(store, size: int, filter_func, vectorize: bool = False):
+    """
+    Selects values with a boolean mask computed by one call of filter_func on the whole array. Only used when
+    vectorize is True, since an arbitrary predicate cannot be known to work element-wise
+
+    :return: a (storage, size) pair holding the kept values, or None to fall back to the Python loop
+    """
+    values = as_ndarray(store, size)
+    if values is None or size == 0 or not vectorize:
+        return None
+    mask = _call_whole(filter_func, _widened(values))
+    if mask is None:
+        return None
+    # uses the same truthiness the Python loop would (non-zero numbers are true)
+    return _to_storage(values[mask.astype(bool)])
+
+
+def _reduction(reduce_func):
+    """
+    Maps the reduce functions that have a NumPy equivalent to the name of that operation
+    """
+    if reduce_func is operator.add or reduce_func is numpy.add:
+        return "add"
+    if reduce_func is operator.mul or reduce_func is numpy.multiply:
+        return "mul"
+    if reduce_func is min or reduce_func is numpy.minimum:
+        return "min"
+    if reduce_func is max or reduce_func is numpy.maximum:
+        return "max"
+    return None
+
+
+def vector_reduce(store, size: int, reduce_func, initializer=None):
+    """
+    Reduces the values with NumPy when reduce_func is a recognized operation: operator.add / numpy.add (sum),
+    operator.mul / numpy.multiply (product), min / numpy.minimum and max / numpy.maximum.
+
+    The result is the same as the Python loop's: float sums and products are accumulated strictly left to right,
+    integer sums are only vectorized when they cannot overflow, integer products and arrays containing NaN fall
+    back to the loop
+
+    :return: the reduced value, or NOT_VECTORIZED to fall back to the Python loop
+    """
+    values = as_ndarray(store, size)
+    if values is None or size == 0:
+        return NOT_VECTORIZED
+    operation = _reduction(reduce_func)
+    if operation is None:
+        return NOT_VECTORIZED
+    is_float = values.dtype.kind == "f"
+    if is_float and numpy.isnan(values).any():
+        return NOT_VECTORIZED
+
+    if operation in ("min", "max"):
+        result = (values.min() if operation == "min" else values.max()).item()
+        if initializer is None:
+            return result
+        return reduce_func(initializer, result)
+
+    if not is_float:
+        if operation == "mul" or not isinstance(initializer, (int, type(None))):
+            return NOT_VECTORIZED
+        # an integer sum is exact as long as no partial sum can leave the int64 range
+        bound = max(abs(int(values.min())), abs(int(values.max()))) * size + abs(initializer or 0)
+        if bound >= 2 ** 63:
+            return NOT_VECTORIZED
+        return int(values.sum(dtype=numpy.int64)) + (initializer or 0)
+
+    # Python floats are doubles, so float32 values are widened (exactly) before doing any arithmetic
+    values = values.astype(numpy.float64)
+    if initializer is not None:
+        if not isinstance(initializer, (int, float)):
+            return NOT_VECTORIZED
+        values = numpy.concatenate((numpy.array([initializer], dtype=numpy.float64), values))
+    ufunc = numpy.add if operation == "add" else numpy.multiply
+    # accumulate works strictly left to right, unlike reduce which sums pairwise. Overflow gives inf, like it
+    # does for Python floats
+    with numpy.errstate(over="ignore"):
+        return ufunc.accumulate(values)[-1].item()
+
+
+def vector_sort(store, size: int, descending: bool = True) -> bool:
+    """
+    Sorts the values in place with numpy.sort
+
+    :return: True if the values were sorted, False to fall back to heapsort
+    """
+    values = as_ndarray(store, size)
+    if values is None:
+        return False
+    if values.dtype.kind == "f" and numpy.isnan(values).any():
+        return False
+    ordered = numpy.sort(values)
+    values[:] = ordered[::-1] if descending else ordered
+    return True
+
+
+# ------------------- BASIC TESTING -----------------------------------------
+
+
+if __name__ == "__main__":
+    import random
+    from dynamic_array import DynamicArray
+    from min_heap import heapsort
+
+    print("NumPy available:", available())
+    if not available():
+        print("NumPy is not installed: the checks below only compare the pure Python path with itself")
+
+    print("\n# vectorized results compared with the pure Python path")
+    random.seed(261)
+    for typecode in "qid":
+        if typecode == "d":
+            values = [random.uniform(-1000, 1000) for _ in range(500)]
+        else:
+            values = [random.randint(-1000, 1000) for _ in range(500)]
+        typed = DynamicArray(values, typecode=typecode)
+        plain = DynamicArray(values)
+        for func in (operator.add, operator.mul, min, max):
+            for initializer in (None, 3):
+                assert typed.reduce(func, initializer) == plain.reduce(func, initializer)
+        assert list(typed.filter(lambda x: x > 10, vectorize=True)) == list(plain.filter(lambda x: x > 10))
+        in_range = lambda x: 10 <= x <= 20
+        assert list(typed.filter(in_range, vectorize=True)) == list(plain.filter(in_range))
+        # a filter that keeps nothing still returns an empty typed array, like the Python loop does
+        empty = typed.filter(lambda x: x > 10 ** 6, vectorize=True)
+        assert empty.length() == 0 and empty.get_typecode() == typecode == typed.filter(lambda x: False).get_typecode()
+        assert list(typed.map(lambda x: x * 2, vectorize=True)) == list(plain.map(lambda x: x * 2))
+        # the results above must have come from the fast path whenever NumPy is there
+        assert (vector_map(typed._data, typed.length(), lambda x: x * 2, vectorize=True) is not None) == available()
+        heapsort(typed)
+        heapsort(plain)
+        assert list(typed) == list(plain)
+        print(f"typecode '{typecode}': map / filter / reduce / heapsort match")
+
+    print("\n# integer results at the edges of the 64-bit range")
+    edges = [2 ** 63 - 1, -2 ** 63, 2 ** 62, -2 ** 62, 3037000500, 0, -1]
+    for typecode, values in (("q", edges), ("Q", [2 ** 64 - 1, 2 ** 63, 2 ** 32, 0])):
+        typed = DynamicArray(values, typecode=typecode)
+        for func in (lambda x: x * 2, lambda x: x + 1, lambda x: x - 1, lambda x: x * x, lambda x: -x):
+            assert list(typed.map(func, vectorize=True)) == [func(value) for value in values]
+        # an integer sum that could overflow int64 is left to the Python loop as well
+        assert typed.reduce(operator.add) == sum(values)
+        print(f"typecode '{typecode}': results match the Python loop instead of wrapping")
+    small = DynamicArray(range(-100, 100), typecode='q')
+    fast = vector_map(small._data, small.length(), lambda x: x * 2, vectorize=True) is not None
+    print("fast path used for values that cannot wrap:", fast)